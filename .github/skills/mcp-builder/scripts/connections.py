@@ -1,10 +1,13 @@
 """Lightweight connection handling for MCP servers."""
 
+import asyncio
+import time
 from abc import ABC, abstractmethod
-from contextlib import AsyncExitStack
-from typing import Any
+from collections import deque
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import Any, AsyncIterator
 
-from mcp import ClientSession, StdioServerParameters
+from mcp import ClientSession, StdioServerParameters, types
 from mcp.client.sse import sse_client
 from mcp.client.stdio import stdio_client
 from mcp.client.streamable_http import streamablehttp_client
@@ -16,6 +19,7 @@ class MCPConnection(ABC):
     def __init__(self):
         self.session = None
         self._stack = None
+        self._tools = None
 
     @abstractmethod
     def _create_context(self):
@@ -37,7 +41,7 @@ class MCPConnection(ABC):
             else:
                 raise ValueError(f"Unexpected context result: {result}")
 
-            session_ctx = ClientSession(read, write)
+            session_ctx = ClientSession(read, write, message_handler=self._handle_message)
             self.session = await self._stack.enter_async_context(session_ctx)
             await self.session.initialize()
             return self
@@ -51,18 +55,38 @@ class MCPConnection(ABC):
             await self._stack.__aexit__(exc_type, exc_val, exc_tb)
         self.session = None
         self._stack = None
+        self._tools = None
+
+    async def _handle_message(self, message) -> None:
+        """Drop the cached tool list when the server announces that it changed."""
+        if isinstance(message, types.ServerNotification) and isinstance(message.root, types.ToolListChangedNotification):
+            self._tools = None
 
     async def list_tools(self) -> list[dict[str, Any]]:
-        """Retrieve available tools from the MCP server."""
-        response = await self.session.list_tools()
-        return [
-            {
-                "name": tool.name,
-                "description": tool.description,
-                "input_schema": tool.inputSchema,
-            }
-            for tool in response.tools
-        ]
+        """Retrieve available tools from the MCP server.
+
+        The list is cached for the lifetime of the session until the server sends
+        notifications/tools/list_changed.
+        """
+        if self._tools is None:
+            response = await self.session.list_tools()
+            self._tools = [
+                {
+                    "name": tool.name,
+                    "description": tool.description,
+                    "input_schema": tool.inputSchema,
+                }
+                for tool in response.tools
+            ]
+        return self._tools
+
+    async def ping(self, timeout: float = 5.0) -> bool:
+        """Check that the session still answers."""
+        try:
+            await asyncio.wait_for(self.session.send_ping(), timeout)
+            return True
+        except Exception:
+            return False
 
     async def call_tool(self, tool_name: str, arguments: dict[str, Any]) -> Any:
         """Call a tool on the MCP server with provided arguments."""
@@ -149,3 +173,131 @@ def create_connection(
 
     else:
         raise ValueError(f"Unsupported transport type: {transport}. Use 'stdio', 'sse', or 'http'")
+
+
+class _PooledConnection:
+    """An initialized connection owned by a dedicated task.
+
+    The transports are built on anyio task groups, which must be exited by the task that
+    entered them, so the owner task keeps the connection open until it is closed.
+    """
+
+    def __init__(self, connection: MCPConnection):
+        self.connection = connection
+        self.last_used = time.monotonic()
+        self._close = asyncio.Event()
+        self._task = None
+
+    async def open(self):
+        ready = asyncio.get_running_loop().create_future()
+
+        async def own():
+            try:
+                async with self.connection:
+                    ready.set_result(None)
+                    await self._close.wait()
+            except Exception as e:
+                if not ready.done():
+                    ready.set_exception(e)
+
+        self._task = asyncio.create_task(own())
+        await ready
+
+    @property
+    def alive(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def close(self):
+        self._close.set()
+        if self._task:
+            await asyncio.gather(self._task, return_exceptions=True)
+
+
+class MCPConnectionPool:
+    """Pool of initialized MCP sessions per server, so repeated use skips the handshake.
+
+    Sessions are handed out exclusively and returned to the pool afterwards. A session idle
+    for more than `health_check_after` seconds is pinged before reuse, and one idle for more
+    than `idle_timeout` seconds is closed. At most `max_idle` sessions are kept per server.
+    Each session keeps its cached tool list across uses.
+    """
+
+    def __init__(
+        self,
+        max_idle: int = 4,
+        idle_timeout: float = 300.0,
+        health_check_after: float = 30.0,
+        health_check_timeout: float = 5.0,
+    ):
+        self.max_idle = max_idle
+        self.idle_timeout = idle_timeout
+        self.health_check_after = health_check_after
+        self.health_check_timeout = health_check_timeout
+        self._idle: dict[tuple, deque[_PooledConnection]] = {}
+        self._closed = False
+
+    @staticmethod
+    def _key(transport: str, **kwargs) -> tuple:
+        def freeze(value):
+            if isinstance(value, dict):
+                return tuple(sorted(value.items()))
+            if isinstance(value, list):
+                return tuple(value)
+            return value
+
+        return (transport.lower(),) + tuple((name, freeze(value)) for name, value in sorted(kwargs.items()))
+
+    async def _prune(self, idle: deque[_PooledConnection]):
+        now = time.monotonic()
+        expired = [pooled for pooled in idle if not pooled.alive or now - pooled.last_used > self.idle_timeout]
+        for pooled in expired:
+            idle.remove(pooled)
+            await pooled.close()
+
+    async def _acquire(self, key: tuple, transport: str, kwargs: dict[str, Any]) -> _PooledConnection:
+        idle = self._idle.setdefault(key, deque())
+        await self._prune(idle)
+        while idle:
+            pooled = idle.pop()
+            if time.monotonic() - pooled.last_used <= self.health_check_after:
+                return pooled
+            if await pooled.connection.ping(self.health_check_timeout):
+                return pooled
+            await pooled.close()
+
+        pooled = _PooledConnection(create_connection(transport, **kwargs))
+        await pooled.open()
+        return pooled
+
+    async def _release(self, key: tuple, pooled: _PooledConnection):
+        idle = self._idle.setdefault(key, deque())
+        pooled.last_used = time.monotonic()
+        if self._closed or not pooled.alive or len(idle) >= self.max_idle:
+            await pooled.close()
+        else:
+            idle.append(pooled)
+
+    @asynccontextmanager
+    async def connection(self, transport: str, **kwargs) -> AsyncIterator[MCPConnection]:
+        """Borrow an initialized connection; accepts the same arguments as create_connection."""
+        if self._closed:
+            raise RuntimeError("Connection pool is closed")
+        key = self._key(transport, **kwargs)
+        pooled = await self._acquire(key, transport, kwargs)
+        try:
+            yield pooled.connection
+        finally:
+            await self._release(key, pooled)
+
+    async def close(self):
+        """Close all idle sessions; sessions in use are closed when they are returned."""
+        self._closed = True
+        for idle in self._idle.values():
+            while idle:
+                await idle.pop().close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
@@ -6,17 +6,21 @@ This script evaluates MCP servers by running test questions against them using C
 import argparse
 import asyncio
 import json
+import os
 import re
 import sys
+import tempfile
 import time
 import traceback
 import xml.etree.ElementTree as ET
 from pathlib import Path
-from typing import Any
+from typing import Any, AsyncContextManager, Callable, Iterable, Iterator, TextIO
 
-from anthropic import Anthropic
+from anthropic import AsyncAnthropic
 
-from connections import create_connection
+from connections import MCPConnectionPool, create_connection
+from stats import percentile
+from transcripts import RecordingClient, ReplayClient
 
 EVALUATION_PROMPT = """You are an AI assistant with access to tools.
 
@@ -83,76 +87,94 @@ def extract_xml_content(text: str, tag: str) -> str | None:
     return matches[-1].strip() if matches else None
 
 
+async def execute_tool(connection: Any, tool_name: str, tool_input: dict[str, Any]) -> tuple[str, float]:
+    """Call an MCP tool and return its response text and duration."""
+    tool_start_ts = time.time()
+    try:
+        tool_result = await connection.call_tool(tool_name, tool_input)
+        tool_response = json.dumps(tool_result) if isinstance(tool_result, (dict, list)) else str(tool_result)
+    except Exception as e:
+        tool_response = f"Error executing tool {tool_name}: {str(e)}\n"
+        tool_response += traceback.format_exc()
+    return tool_response, time.time() - tool_start_ts
+
+
 async def agent_loop(
-    client: Anthropic,
+    client: AsyncAnthropic,
     model: str,
     question: str,
     tools: list[dict[str, Any]],
     connection: Any,
-) -> tuple[str, dict[str, Any]]:
-    """Run the agent loop with MCP tools."""
+) -> tuple[str, dict[str, Any], dict[str, Any]]:
+    """Run the agent loop with MCP tools.
+
+    Returns the final response text, the per-tool call metrics and a profile of the time spent
+    waiting for the model versus the tools, with the model's token usage.
+    """
     messages = [{"role": "user", "content": question}]
+    profile = {"model_duration": 0.0, "tool_duration": 0.0, "model_calls": 0, "input_tokens": 0, "output_tokens": 0}
 
-    response = await asyncio.to_thread(
-        client.messages.create,
-        model=model,
-        max_tokens=4096,
-        system=EVALUATION_PROMPT,
-        messages=messages,
-        tools=tools,
-    )
+    async def create_message():
+        model_start_ts = time.time()
+        response = await client.messages.create(
+            model=model,
+            max_tokens=4096,
+            system=EVALUATION_PROMPT,
+            messages=messages,
+            tools=tools,
+        )
+        profile["model_duration"] += time.time() - model_start_ts
+        profile["model_calls"] += 1
+        if response.usage:
+            profile["input_tokens"] += response.usage.input_tokens
+            profile["output_tokens"] += response.usage.output_tokens
+        return response
+
+    response = await create_message()
 
     messages.append({"role": "assistant", "content": response.content})
 
     tool_metrics = {}
 
     while response.stop_reason == "tool_use":
-        tool_use = next(block for block in response.content if block.type == "tool_use")
-        tool_name = tool_use.name
-        tool_input = tool_use.input
-
-        tool_start_ts = time.time()
-        try:
-            tool_result = await connection.call_tool(tool_name, tool_input)
-            tool_response = json.dumps(tool_result) if isinstance(tool_result, (dict, list)) else str(tool_result)
-        except Exception as e:
-            tool_response = f"Error executing tool {tool_name}: {str(e)}\n"
-            tool_response += traceback.format_exc()
-        tool_duration = time.time() - tool_start_ts
-
-        if tool_name not in tool_metrics:
-            tool_metrics[tool_name] = {"count": 0, "durations": []}
-        tool_metrics[tool_name]["count"] += 1
-        tool_metrics[tool_name]["durations"].append(tool_duration)
+        # Independent tool calls of one turn run concurrently; the API expects all their results together
+        tool_uses = [block for block in response.content if block.type == "tool_use"]
+        tools_start_ts = time.time()
+        tool_results = await asyncio.gather(*(
+            execute_tool(connection, tool_use.name, tool_use.input) for tool_use in tool_uses
+        ))
+        profile["tool_duration"] += time.time() - tools_start_ts
+
+        for tool_use, (tool_response, tool_duration) in zip(tool_uses, tool_results):
+            if tool_use.name not in tool_metrics:
+                tool_metrics[tool_use.name] = {"count": 0, "durations": []}
+            tool_metrics[tool_use.name]["count"] += 1
+            tool_metrics[tool_use.name]["durations"].append(tool_duration)
 
         messages.append({
             "role": "user",
-            "content": [{
-                "type": "tool_result",
-                "tool_use_id": tool_use.id,
-                "content": tool_response,
-            }]
+            "content": [
+                {
+                    "type": "tool_result",
+                    "tool_use_id": tool_use.id,
+                    "content": tool_response,
+                }
+                for tool_use, (tool_response, _) in zip(tool_uses, tool_results)
+            ]
         })
 
-        response = await asyncio.to_thread(
-            client.messages.create,
-            model=model,
-            max_tokens=4096,
-            system=EVALUATION_PROMPT,
-            messages=messages,
-            tools=tools,
-        )
+        response = await create_message()
         messages.append({"role": "assistant", "content": response.content})
 
     response_text = next(
         (block.text for block in response.content if hasattr(block, "text")),
         None,
     )
-    return response_text, tool_metrics
+    return response_text, tool_metrics, profile
 
 
 async def evaluate_single_task(
-    client: Anthropic,
+    client: AsyncAnthropic,
     model: str,
     qa_pair: dict[str, Any],
     tools: list[dict[str, Any]],
@@ -163,7 +185,7 @@ async def evaluate_single_task(
     start_time = time.time()
 
     print(f"Task {task_index + 1}: Running task with question: {qa_pair['question']}")
-    response, tool_metrics = await agent_loop(client, model, qa_pair["question"], tools, connection)
+    response, tool_metrics, profile = await agent_loop(client, model, qa_pair["question"], tools, connection)
 
     response_value = extract_xml_content(response, "response")
     summary = extract_xml_content(response, "summary")
@@ -179,11 +201,57 @@ async def evaluate_single_task(
         "total_duration": duration_seconds,
         "tool_calls": tool_metrics,
         "num_tool_calls": sum(len(metrics["durations"]) for metrics in tool_metrics.values()),
+        **profile,
         "summary": summary,
         "feedback": feedback,
     }
 
 
+def summarize_results(results: Iterable[dict[str, Any]]) -> dict[str, Any]:
+    """Aggregate accuracy, time split, token usage and per-tool latency percentiles in one pass."""
+    total = correct = total_tool_calls = input_tokens = output_tokens = 0
+    total_duration = model_duration = tool_duration = 0.0
+    durations_by_tool: dict[str, list[float]] = {}
+
+    for result in results:
+        total += 1
+        correct += result["score"]
+        total_tool_calls += result["num_tool_calls"]
+        total_duration += result["total_duration"]
+        model_duration += result["model_duration"]
+        tool_duration += result["tool_duration"]
+        input_tokens += result["input_tokens"]
+        output_tokens += result["output_tokens"]
+        for tool_name, metrics in result["tool_calls"].items():
+            durations_by_tool.setdefault(tool_name, []).extend(metrics["durations"])
+
+    waited = model_duration + tool_duration
+    return {
+        "correct": correct,
+        "total": total,
+        "accuracy": (correct / total) * 100 if total else 0,
+        "average_duration_s": total_duration / total if total else 0,
+        "average_tool_calls": total_tool_calls / total if total else 0,
+        "total_tool_calls": total_tool_calls,
+        "model_duration_s": model_duration,
+        "tool_duration_s": tool_duration,
+        "model_share": model_duration / waited if waited else 0,
+        "tool_share": tool_duration / waited if waited else 0,
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens,
+        "tools": {
+            tool_name: {
+                "count": len(durations),
+                "average_s": sum(durations) / len(durations),
+                "p50_s": percentile(durations, 50),
+                "p90_s": percentile(durations, 90),
+                "p99_s": percentile(durations, 99),
+            }
+            for tool_name, durations in sorted(durations_by_tool.items())
+        },
+    }
+
+
 REPORT_HEADER = """
 # Evaluation Report
 
@@ -193,10 +261,20 @@ REPORT_HEADER = """
 - **Average Task Duration**: {average_duration_s:.2f}s
 - **Average Tool Calls per Task**: {average_tool_calls:.2f}
 - **Total Tool Calls**: {total_tool_calls}
+- **Model Time**: {model_duration_s:.2f}s ({model_share:.0%})
+- **Tool Time**: {tool_duration_s:.2f}s ({tool_share:.0%})
+- **Tokens**: {input_tokens} input, {output_tokens} output
+
+## Tool Latency
 
+| Tool | Calls | Average | p50 | p90 | p99 |
+|---|---|---|---|---|---|
+{tool_rows}
 ---
 """
 
+TOOL_ROW = "| {tool_name} | {count} | {average_s:.3f}s | {p50_s:.3f}s | {p90_s:.3f}s | {p99_s:.3f}s |\n"
+
 TASK_TEMPLATE = """
 ### Task {task_num}
 
@@ -204,7 +282,8 @@ TASK_TEMPLATE = """
 **Ground Truth Answer**: `{expected_answer}`
 **Actual Answer**: `{actual_answer}`
 **Correct**: {correct_indicator}
-**Duration**: {total_duration:.2f}s
+**Duration**: {total_duration:.2f}s (model {model_duration:.2f}s, tools {tool_duration:.2f}s)
+**Tokens**: {input_tokens} input, {output_tokens} output
 **Tool Calls**: {tool_calls}
 
 **Summary**
@@ -217,61 +296,183 @@ TASK_TEMPLATE = """
 """
 
 
-async def run_evaluation(
-    eval_path: Path,
-    connection: Any,
-    model: str = "claude-3-7-sonnet-20250219",
-) -> str:
-    """Run evaluation with MCP server tools."""
-    print("🚀 Starting Evaluation")
-
-    client = Anthropic()
-
-    tools = await connection.list_tools()
-    print(f"📋 Loaded {len(tools)} tools from MCP server")
-
-    qa_pairs = parse_evaluation_file(eval_path)
-    print(f"📋 Loaded {len(qa_pairs)} evaluation tasks")
-
-    results = []
-    for i, qa_pair in enumerate(qa_pairs):
-        print(f"Processing task {i + 1}/{len(qa_pairs)}")
-        result = await evaluate_single_task(client, model, qa_pair, tools, connection, i)
-        results.append(result)
-
-    correct = sum(r["score"] for r in results)
-    accuracy = (correct / len(results)) * 100 if results else 0
-    average_duration_s = sum(r["total_duration"] for r in results) / len(results) if results else 0
-    average_tool_calls = sum(r["num_tool_calls"] for r in results) / len(results) if results else 0
-    total_tool_calls = sum(r["num_tool_calls"] for r in results)
+def load_completed_tasks(results_path: Path, qa_pairs: list[dict[str, Any]]) -> set[int]:
+    """Indices of the tasks already recorded in a results file, for resuming an interrupted run.
+
+    A line left incomplete by a crash is cut off so new results are appended after it.
+    """
+    if not results_path.exists():
+        return set()
+
+    data = results_path.read_bytes()
+    if data and not data.endswith(b"\n"):
+        with results_path.open("r+b") as results_file:
+            results_file.truncate(data.rfind(b"\n") + 1)
+
+    completed = set()
+    with results_path.open(encoding="utf-8") as results_file:
+        for line in results_file:
+            try:
+                result = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            task_index = result.get("task_index")
+            # Only trust a result for the same question at the same position of the evaluation file
+            if isinstance(task_index, int) and task_index < len(qa_pairs) and result.get("question") == qa_pairs[task_index]["question"]:
+                completed.add(task_index)
+    return completed
+
+
+def iter_results(results_path: Path) -> Iterator[dict[str, Any]]:
+    """Yield the results of a JSONL results file in task order, one at a time.
+
+    Lines are appended as tasks complete, so only their offsets are indexed; the last line of
+    a task wins if it was run more than once.
+    """
+    offsets: dict[int, int] = {}
+    with results_path.open("rb") as results_file:
+        offset = 0
+        for line in results_file:
+            try:
+                offsets[json.loads(line)["task_index"]] = offset
+            except (json.JSONDecodeError, KeyError, TypeError):
+                pass
+            offset += len(line)
+
+        for task_index in sorted(offsets):
+            results_file.seek(offsets[task_index])
+            yield json.loads(results_file.readline())
+
+
+def render_report(results_path: Path, model: str, json_output: Path | None = None) -> str:
+    """Render the Markdown report from a JSONL results file, optionally also writing it as JSON."""
+    summary = summarize_results(iter_results(results_path))
+
+    if json_output:
+        with json_output.open("w", encoding="utf-8") as json_file:
+            json_file.write(f'{{"model": {json.dumps(model)}, "summary": {json.dumps(summary)}, "tasks": [')
+            for i, result in enumerate(iter_results(results_path)):
+                json_file.write((",\n" if i else "\n") + json.dumps(result))
+            json_file.write("\n]}\n")
 
     report = REPORT_HEADER.format(
-        correct=correct,
-        total=len(results),
-        accuracy=accuracy,
-        average_duration_s=average_duration_s,
-        average_tool_calls=average_tool_calls,
-        total_tool_calls=total_tool_calls,
+        **summary,
+        tool_rows="".join(
+            TOOL_ROW.format(tool_name=tool_name, **stats)
+            for tool_name, stats in summary["tools"].items()
+        ),
     )
 
-    report += "".join([
+    report += "".join(
         TASK_TEMPLATE.format(
-            task_num=i + 1,
-            question=qa_pair["question"],
-            expected_answer=qa_pair["answer"],
+            task_num=result["task_index"] + 1,
+            question=result["question"],
+            expected_answer=result["expected"],
             actual_answer=result["actual"] or "N/A",
             correct_indicator="✅" if result["score"] else "❌",
             total_duration=result["total_duration"],
+            model_duration=result["model_duration"],
+            tool_duration=result["tool_duration"],
+            input_tokens=result["input_tokens"],
+            output_tokens=result["output_tokens"],
             tool_calls=json.dumps(result["tool_calls"], indent=2),
             summary=result["summary"] or "N/A",
             feedback=result["feedback"] or "N/A",
         )
-        for i, (qa_pair, result) in enumerate(zip(qa_pairs, results))
-    ])
+        for result in iter_results(results_path)
+    )
 
     return report
 
 
+async def run_evaluation(
+    eval_path: Path,
+    connect: Callable[[], AsyncContextManager[Any]],
+    model: str = "claude-3-7-sonnet-20250219",
+    concurrency: int = 1,
+    client: Any = None,
+    json_output: Path | None = None,
+    results_path: Path | None = None,
+) -> str:
+    """Run evaluation with MCP server tools.
+
+    `connect()` lends an initialized connection as a context manager, for example a partial
+    of MCPConnectionPool.connection. Up to `concurrency` tasks run at the same time, each over
+    a connection of its own and with its own conversation. A failing task is reported as
+    incorrect without stopping the others, and the report keeps the order of the evaluation
+    file. `client` defaults to AsyncAnthropic; pass a RecordingClient or ReplayClient to
+    record or replay the model's responses.
+    With `json_output`, the summary and per-task results are also written there as JSON.
+
+    Each result is appended to the JSONL file `results_path` as soon as its task completes,
+    and the report is rendered from that file. Tasks already in the file are skipped, so an
+    interrupted run resumes where it stopped. Without `results_path` a temporary file is used.
+    """
+    print("🚀 Starting Evaluation")
+
+    client = client or AsyncAnthropic()
+
+    async with connect() as connection:
+        tools = await connection.list_tools()
+    print(f"📋 Loaded {len(tools)} tools from MCP server")
+
+    qa_pairs = parse_evaluation_file(eval_path)
+    print(f"📋 Loaded {len(qa_pairs)} evaluation tasks")
+
+    temporary_results = results_path is None
+    if temporary_results:
+        fd, name = tempfile.mkstemp(prefix="evaluation-", suffix=".jsonl")
+        os.close(fd)
+        results_path = Path(name)
+
+    completed = load_completed_tasks(results_path, qa_pairs)
+    if completed:
+        print(f"⏩ Resuming: {len(completed)}/{len(qa_pairs)} tasks already in {results_path}")
+
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def run_task(i: int, qa_pair: dict[str, Any], results_file: TextIO):
+        async with semaphore:
+            print(f"Processing task {i + 1}/{len(qa_pairs)}")
+            start_time = time.time()
+            try:
+                async with connect() as connection:
+                    result = await evaluate_single_task(client, model, qa_pair, tools, connection, i)
+            except Exception as e:
+                print(f"❌ Task {i + 1} failed: {e}")
+                result = {
+                    "question": qa_pair["question"],
+                    "expected": qa_pair["answer"],
+                    "actual": None,
+                    "score": 0,
+                    "total_duration": time.time() - start_time,
+                    "tool_calls": {},
+                    "num_tool_calls": 0,
+                    "model_duration": 0.0,
+                    "tool_duration": 0.0,
+                    "model_calls": 0,
+                    "input_tokens": 0,
+                    "output_tokens": 0,
+                    "summary": None,
+                    "feedback": f"Task failed: {e}",
+                }
+        results_file.write(json.dumps({"task_index": i, **result}) + "\n")
+        results_file.flush()
+
+    try:
+        with results_path.open("a", encoding="utf-8") as results_file:
+            await asyncio.gather(*(
+                run_task(i, qa_pair, results_file)
+                for i, qa_pair in enumerate(qa_pairs)
+                if i not in completed
+            ))
+
+        return render_report(results_path, model, json_output)
+    finally:
+        if temporary_results:
+            results_path.unlink(missing_ok=True)
+
+
 def parse_headers(header_list: list[str]) -> dict[str, str]:
     """Parse header strings in format 'Key: Value' into a dictionary."""
     headers = {}
@@ -316,12 +517,17 @@ Examples:
 
   # Evaluate an HTTP MCP server with custom model
   python evaluation.py -t http -u https://example.com/mcp -m claude-3-5-sonnet-20241022 eval.xml
+
+  # Record the model's responses once, then replay them offline against a new server build
+  python evaluation.py -t http -u http://localhost:8080/mcp --record transcripts.json eval.xml
+  python evaluation.py -t http -u http://localhost:8080/mcp --replay transcripts.json eval.xml
         """,
     )
 
     parser.add_argument("eval_file", type=Path, help="Path to evaluation XML file")
     parser.add_argument("-t", "--transport", choices=["stdio", "sse", "http"], default="stdio", help="Transport type (default: stdio)")
     parser.add_argument("-m", "--model", default="claude-3-7-sonnet-20250219", help="Claude model to use (default: claude-3-7-sonnet-20250219)")
+    parser.add_argument("-j", "--concurrency", type=int, default=1, help="Number of tasks to run concurrently, each over its own server session (default: 1)")
 
     stdio_group = parser.add_argument_group("stdio options")
     stdio_group.add_argument("-c", "--command", help="Command to run MCP server (stdio only)")
@@ -333,6 +539,12 @@ Examples:
     remote_group.add_argument("-H", "--header", nargs="+", dest="headers", help="HTTP headers in 'Key: Value' format (sse/http only)")
 
     parser.add_argument("-o", "--output", type=Path, help="Output file for evaluation report (default: stdout)")
+    parser.add_argument("--json", type=Path, dest="json_output", help="Also write the results as JSON to this file")
+    parser.add_argument("-r", "--results", type=Path, help="JSONL file each result is appended to as its task completes; rerun with the same file to resume an interrupted run")
+
+    replay_group = parser.add_mutually_exclusive_group()
+    replay_group.add_argument("--record", type=Path, help="Record the model's responses to this file")
+    replay_group.add_argument("--replay", type=Path, help="Replay recorded model responses from this file instead of calling the model API")
 
     args = parser.parse_args()
 
@@ -340,27 +552,56 @@ Examples:
         print(f"Error: Evaluation file not found: {args.eval_file}")
         sys.exit(1)
 
+    if args.replay and not args.replay.exists():
+        print(f"Error: Recording not found: {args.replay}")
+        sys.exit(1)
+
     headers = parse_headers(args.headers) if args.headers else None
     env_vars = parse_env_vars(args.env) if args.env else None
 
+    connection_args = {
+        "command": args.command,
+        "args": args.args,
+        "env": env_vars,
+        "url": args.url,
+        "headers": headers,
+    }
     try:
-        connection = create_connection(
-            transport=args.transport,
-            command=args.command,
-            args=args.args,
-            env=env_vars,
-            url=args.url,
-            headers=headers,
-        )
+        # Only validates the arguments; the pool opens the sessions
+        create_connection(args.transport, **connection_args)
     except ValueError as e:
         print(f"Error: {e}")
         sys.exit(1)
 
     print(f"🔗 Connecting to MCP server via {args.transport}...")
 
-    async with connection:
-        print("✅ Connected successfully")
-        report = await run_evaluation(args.eval_file, connection, args.model)
+    # Keep one idle session per concurrent task so each task reuses an initialized session
+    async with MCPConnectionPool(max_idle=max(1, args.concurrency)) as pool:
+        def connect():
+            return pool.connection(args.transport, **connection_args)
+
+        if args.replay:
+            client = ReplayClient(args.replay)
+        elif args.record:
+            client = RecordingClient(AsyncAnthropic(), args.record)
+        else:
+            client = None
+
+        report = await run_evaluation(
+            args.eval_file,
+            connect,
+            args.model,
+            args.concurrency,
+            client,
+            args.json_output,
+            args.results,
+        )
+
+        if args.record:
+            client.save()
+            print(f"\n✅ Model responses recorded to {args.record}")
+        if args.replay and client.mismatches:
+            print(f"\n⚠️  Tool results differed from the recording in {len(client.mismatches)} task(s)")
 
         if args.output:
             args.output.write_text(report)
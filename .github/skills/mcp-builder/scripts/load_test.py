@@ -0,0 +1,351 @@
+"""MCP Server Load Test
+
+This script opens concurrent sessions against remote MCP servers (SSE or Streamable HTTP),
+issues a mix of tool calls at a target rate and reports initialize latency, call latency
+percentiles and error rates per transport.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+from connections import MCPConnection, MCPConnectionPool
+from stats import percentile
+
+
+def summarize_latencies(latencies: list[float]) -> dict[str, float]:
+    """Latency statistics in milliseconds."""
+    return {
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p90_ms": percentile(latencies, 90) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "max_ms": max(latencies, default=0.0) * 1000,
+    }
+
+
+class LoadTestResult:
+    """Raw measurements of one load test target."""
+
+    def __init__(self, transport: str, url: str):
+        self.transport = transport
+        self.url = url
+        self.init_latencies: list[float] = []
+        self.init_errors: list[str] = []
+        self.calls: dict[str, list[float]] = {}
+        self.call_errors: dict[str, int] = {}
+        self.error_samples: list[str] = []
+        self.elapsed = 0.0
+
+    def record_call(self, tool_name: str, latency: float, error: str | None = None):
+        self.calls.setdefault(tool_name, []).append(latency)
+        if error:
+            self.call_errors[tool_name] = self.call_errors.get(tool_name, 0) + 1
+            if len(self.error_samples) < 5 and f"{tool_name}: {error}" not in self.error_samples:
+                self.error_samples.append(f"{tool_name}: {error}")
+
+    def summary(self) -> dict[str, Any]:
+        all_latencies = [latency for latencies in self.calls.values() for latency in latencies]
+        total_calls = len(all_latencies)
+        total_errors = sum(self.call_errors.values())
+        sessions = len(self.init_latencies) + len(self.init_errors)
+        return {
+            "transport": self.transport,
+            "url": self.url,
+            "sessions": sessions,
+            "session_errors": len(self.init_errors),
+            "initialize": summarize_latencies(self.init_latencies),
+            "calls": total_calls,
+            "errors": total_errors,
+            "error_rate": total_errors / total_calls if total_calls else 0.0,
+            "throughput_rps": total_calls / self.elapsed if self.elapsed else 0.0,
+            "latency": summarize_latencies(all_latencies),
+            "tools": {
+                tool_name: {
+                    "calls": len(latencies),
+                    "errors": self.call_errors.get(tool_name, 0),
+                    **summarize_latencies(latencies),
+                }
+                for tool_name, latencies in sorted(self.calls.items())
+            },
+            "error_samples": self.error_samples,
+        }
+
+
+async def timed_call(
+    connection: MCPConnection,
+    tool_name: str,
+    arguments: dict[str, Any],
+    result: LoadTestResult,
+):
+    """Call a tool and record its latency; protocol errors and isError results both count as errors."""
+    start = time.perf_counter()
+    try:
+        response = await connection.session.call_tool(tool_name, arguments=arguments)
+        error = None
+        if response.isError:
+            text = next((block.text for block in response.content if hasattr(block, "text")), "")
+            error = f"isError: {text[:200]}"
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    result.record_call(tool_name, time.perf_counter() - start, error)
+
+
+async def run_target(
+    transport: str,
+    url: str,
+    headers: dict[str, str] | None,
+    call_mix: list[tuple[str, dict[str, Any]]],
+    sessions: int,
+    rate: float,
+    duration: float,
+    max_in_flight: int,
+) -> LoadTestResult:
+    """Open `sessions` sessions against one server and drive the call mix for `duration` seconds.
+
+    With a `rate` the calls are issued open-loop at that many calls per second in total,
+    spread round-robin over the sessions, so slow responses do not slow down the offered load.
+    Without a rate every session calls back-to-back (closed loop).
+    """
+    result = LoadTestResult(transport, url)
+    connections: list[MCPConnection] = []
+    opened = 0
+    all_opened = asyncio.Event()
+    start_load = asyncio.Event()
+    stop_load = asyncio.Event()
+
+    async def run_session(pool: MCPConnectionPool):
+        nonlocal opened
+        connection = None
+        start = time.perf_counter()
+        try:
+            async with pool.connection(transport, url=url, headers=headers) as connection:
+                result.init_latencies.append(time.perf_counter() - start)
+                connections.append(connection)
+                opened += 1
+                if opened == sessions:
+                    all_opened.set()
+                await start_load.wait()
+                if rate > 0:
+                    await stop_load.wait()
+                else:
+                    while time.perf_counter() < deadline:
+                        tool_name, arguments = random.choice(call_mix)
+                        await timed_call(connection, tool_name, arguments, result)
+        except Exception as e:
+            if connection not in connections:
+                result.init_errors.append(f"{type(e).__name__}: {e}")
+                opened += 1
+                if opened == sessions:
+                    all_opened.set()
+
+    print(f"🔗 Opening {sessions} {transport} sessions to {url}...")
+    # The pool's owner tasks open and close the transports; keeping no idle sessions means
+    # every session of every target pays for and measures its own handshake
+    pool = MCPConnectionPool(max_idle=0)
+    session_tasks = [asyncio.create_task(run_session(pool)) for _ in range(sessions)]
+    await all_opened.wait()
+    if not connections:
+        print(f"❌ No session could be initialized: {result.init_errors[0]}")
+        await asyncio.gather(*session_tasks)
+        return result
+
+    started = time.perf_counter()
+    deadline = started + duration
+    start_load.set()
+
+    if rate > 0:
+        in_flight = asyncio.Semaphore(max_in_flight)
+        pending: set[asyncio.Task] = set()
+
+        async def issue(connection, tool_name, arguments):
+            async with in_flight:
+                await timed_call(connection, tool_name, arguments, result)
+
+        call_index = 0
+        while True:
+            next_at = started + call_index / rate
+            if next_at >= deadline:
+                break
+            await asyncio.sleep(max(0.0, next_at - time.perf_counter()))
+            tool_name, arguments = random.choice(call_mix)
+            task = asyncio.create_task(issue(connections[call_index % len(connections)], tool_name, arguments))
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+            call_index += 1
+        if pending:
+            await asyncio.gather(*pending)
+        result.elapsed = time.perf_counter() - started
+        stop_load.set()
+        await asyncio.gather(*session_tasks)
+    else:
+        await asyncio.gather(*session_tasks)
+        result.elapsed = time.perf_counter() - started
+
+    return result
+
+
+REPORT_HEADER = """
+# Load Test Report
+
+- **Sessions per target**: {sessions}
+- **Target rate**: {rate}
+- **Duration**: {duration:.0f}s
+
+| Transport | URL | Sessions (failed) | Init p50 / p99 (ms) | Calls | Throughput (calls/s) | Errors | Call p50 / p90 / p99 (ms) |
+|---|---|---|---|---|---|---|---|
+"""
+
+TARGET_ROW = "| {transport} | {url} | {sessions} ({session_errors}) | {init_p50:.1f} / {init_p99:.1f} | {calls} | {throughput_rps:.1f} | {errors} ({error_rate:.1%}) | {p50:.1f} / {p90:.1f} / {p99:.1f} |\n"
+
+TOOLS_HEADER = """
+### {transport} {url}
+
+| Tool | Calls | Errors | p50 (ms) | p90 (ms) | p99 (ms) | max (ms) |
+|---|---|---|---|---|---|---|
+"""
+
+TOOL_ROW = "| {tool_name} | {calls} | {errors} | {p50_ms:.1f} | {p90_ms:.1f} | {p99_ms:.1f} | {max_ms:.1f} |\n"
+
+
+def render_report(summaries: list[dict[str, Any]], sessions: int, rate: float, duration: float) -> str:
+    """Render the load test summaries as Markdown."""
+    report = REPORT_HEADER.format(
+        sessions=sessions,
+        rate=f"{rate:g} calls/s" if rate > 0 else "closed loop",
+        duration=duration,
+    )
+    for summary in summaries:
+        report += TARGET_ROW.format(
+            **summary,
+            init_p50=summary["initialize"]["p50_ms"],
+            init_p99=summary["initialize"]["p99_ms"],
+            p50=summary["latency"]["p50_ms"],
+            p90=summary["latency"]["p90_ms"],
+            p99=summary["latency"]["p99_ms"],
+        )
+
+    for summary in summaries:
+        report += TOOLS_HEADER.format(transport=summary["transport"], url=summary["url"])
+        report += "".join(
+            TOOL_ROW.format(tool_name=tool_name, **stats)
+            for tool_name, stats in summary["tools"].items()
+        )
+        if summary["error_samples"]:
+            report += "\n**Sample errors**\n\n" + "".join(f"- `{error}`\n" for error in summary["error_samples"])
+
+    return report
+
+
+def parse_headers(header_list: list[str]) -> dict[str, str]:
+    """Parse header strings in format 'Key: Value' into a dictionary."""
+    headers = {}
+    if not header_list:
+        return headers
+
+    for header in header_list:
+        if ":" in header:
+            key, value = header.split(":", 1)
+            headers[key.strip()] = value.strip()
+        else:
+            print(f"Warning: Ignoring malformed header: {header}")
+    return headers
+
+
+def parse_call_mix(call_list: list[list[str]]) -> list[tuple[str, dict[str, Any]]]:
+    """Parse --call TOOL [ARGS_JSON] entries into (tool name, arguments) pairs."""
+    call_mix = []
+    for call in call_list:
+        tool_name = call[0]
+        arguments = json.loads(call[1]) if len(call) > 1 else {}
+        if not isinstance(arguments, dict):
+            raise ValueError(f"Arguments for {tool_name} must be a JSON object")
+        call_mix.append((tool_name, arguments))
+    return call_mix
+
+
+def positive_int(value: str) -> int:
+    """argparse type for counts that must be at least 1."""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
+async def main():
+    parser = argparse.ArgumentParser(
+        description="Load test MCP servers over SSE and Streamable HTTP",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # 20 sessions, 50 calls/s for 60s against the weather server
+  python load_test.py -T http http://localhost:8080/mcp -n 20 -r 50 -d 60 \\
+    --call get_cities '{"country": "usa"}' --call get_weather '{"city": "Lisbon"}'
+
+  # Compare transports; repeat a --call to weight it in the mix
+  python load_test.py -T http https://apim.example.com/weather/mcp -T sse https://apim.example.com/weather/sse \\
+    -H "api-key: xxx" --call get_weather '{"city": "Lisbon"}' --call get_weather '{"city": "Porto"}' \\
+    --call get_cities '{"country": "portugal"}' -o report.md --json report.json
+        """,
+    )
+
+    parser.add_argument("-T", "--target", nargs=2, action="append", required=True, metavar=("TRANSPORT", "URL"), help="Transport (sse or http) and server URL; repeat to compare targets")
+    parser.add_argument("--call", nargs="+", action="append", required=True, metavar="TOOL [ARGS_JSON]", help="Tool call to include in the mix; repeat to build the mix")
+    parser.add_argument("-n", "--sessions", type=positive_int, default=10, help="Concurrent sessions per target (default: 10)")
+    parser.add_argument("-r", "--rate", type=float, default=0, help="Total tool calls per second per target; 0 calls back-to-back per session (default: 0)")
+    parser.add_argument("-d", "--duration", type=float, default=30, help="Seconds to run each target (default: 30)")
+    parser.add_argument("--max-in-flight", type=positive_int, default=1000, help="Upper bound on outstanding calls in rate mode (default: 1000)")
+    parser.add_argument("-H", "--header", nargs="+", dest="headers", help="HTTP headers in 'Key: Value' format")
+    parser.add_argument("-o", "--output", type=Path, help="Output file for the Markdown report (default: stdout)")
+    parser.add_argument("--json", type=Path, dest="json_output", help="Also write the results as JSON to this file")
+
+    args = parser.parse_args()
+
+    for transport, _ in args.target:
+        if transport not in ("sse", "http"):
+            print(f"Error: Unsupported transport type: {transport}. Use 'sse' or 'http'")
+            sys.exit(1)
+
+    try:
+        call_mix = parse_call_mix(args.call)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    headers = parse_headers(args.headers) if args.headers else None
+
+    summaries = []
+    for transport, url in args.target:
+        result = await run_target(
+            transport, url, headers, call_mix,
+            sessions=args.sessions,
+            rate=args.rate,
+            duration=args.duration,
+            max_in_flight=args.max_in_flight,
+        )
+        summary = result.summary()
+        summaries.append(summary)
+        print(
+            f"✅ {transport}: {summary['calls']} calls, {summary['throughput_rps']:.1f} calls/s, "
+            f"{summary['error_rate']:.1%} errors, p99 {summary['latency']['p99_ms']:.1f}ms"
+        )
+
+    report = render_report(summaries, args.sessions, args.rate, args.duration)
+
+    if args.json_output:
+        args.json_output.write_text(json.dumps(summaries, indent=2))
+        print(f"\n✅ JSON results saved to {args.json_output}")
+
+    if args.output:
+        args.output.write_text(report)
+        print(f"\n✅ Report saved to {args.output}")
+    else:
+        print("\n" + report)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
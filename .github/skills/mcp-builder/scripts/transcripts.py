@@ -0,0 +1,82 @@
+"""Record and replay model transcripts for offline MCP server evaluations.
+
+A recording captures every model response of an evaluation run, keyed by question and turn.
+Replaying it needs no model API: the stub client returns the recorded responses while the
+tool calls they contain are still executed against the MCP server, so tool latency and
+results can be compared between server versions deterministically.
+"""
+
+import json
+from pathlib import Path
+from typing import Any
+
+from anthropic.types import Message
+
+
+def _conversation(kwargs: dict[str, Any]) -> tuple[str, int, list[str]]:
+    """Question, turn number and tool results of a messages.create request."""
+    messages = kwargs["messages"]
+    question = messages[0]["content"]
+    turn = sum(1 for message in messages if message["role"] == "assistant")
+    tool_results = []
+    if turn:
+        tool_results = [
+            block["content"]
+            for block in messages[-1]["content"]
+            if isinstance(block, dict) and block.get("type") == "tool_result"
+        ]
+    return question, turn, tool_results
+
+
+class _Messages:
+    def __init__(self, create):
+        self.create = create
+
+
+class RecordingClient:
+    """Wraps an AsyncAnthropic client and records its responses; call save() after the run.
+
+    An existing recording is extended, so a resumed evaluation run keeps earlier transcripts.
+    """
+
+    def __init__(self, client, path: Path):
+        self.path = path
+        self._client = client
+        self.transcripts: dict[str, list[dict[str, Any]]] = json.loads(path.read_text())["transcripts"] if path.exists() else {}
+        self.messages = _Messages(self._create)
+
+    async def _create(self, **kwargs) -> Message:
+        question, turn, tool_results = _conversation(kwargs)
+        response = await self._client.messages.create(**kwargs)
+        transcript = self.transcripts.setdefault(question, [])
+        del transcript[turn:]
+        transcript.append({"tool_results": tool_results, "response": response.model_dump(mode="json")})
+        return response
+
+    def save(self):
+        self.path.write_text(json.dumps({"transcripts": self.transcripts}, indent=2))
+
+
+class ReplayClient:
+    """Stub model client that answers from a recording instead of calling the API."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.transcripts: dict[str, list[dict[str, Any]]] = json.loads(path.read_text())["transcripts"]
+        # question -> number of tool results that differed from the recording
+        self.mismatches: dict[str, int] = {}
+        self.messages = _Messages(self._create)
+
+    async def _create(self, **kwargs) -> Message:
+        question, turn, tool_results = _conversation(kwargs)
+        transcript = self.transcripts.get(question)
+        if transcript is None:
+            raise KeyError(f"No recorded transcript for question: {question}")
+        if turn >= len(transcript):
+            raise KeyError(f"Recorded transcript has no turn {turn + 1} for question: {question}")
+
+        recorded = transcript[turn]
+        differing = sum(1 for actual, expected in zip(tool_results, recorded["tool_results"]) if actual != expected)
+        if differing:
+            self.mismatches[question] = self.mismatches.get(question, 0) + differing
+        return Message.model_validate(recorded["response"])
@@ -4,31 +4,39 @@ from mcp.server.fastmcp import FastMCP, Context
 from starlette.applications import Starlette
 from mcp.server.sse import SseServerTransport
 from starlette.requests import Request
+from starlette.responses import JSONResponse
 from starlette.routing import Mount, Route
 from mcp.server import Server
 import uvicorn
+from result_encoder import encode_result
+from tool_cache import cached_tool, cache_stats
 
 # Initialize FastMCP server for Oncall API
 mcp = FastMCP("Oncall")
 
+ONCALL_LIST = [
+    {"id": 1, "firstName": "Julia", "lastName": "Smith", "alias": "jsmith", "status": "on", "timezone": "PST"},
+    {"id": 2, "firstName": "Alex", "lastName": "Johnson", "alias": "ajohnson", "status": "on", "timezone": "EST"},
+    {"id": 3, "firstName": "Maria", "lastName": "Garcia", "alias": "mgarcia", "status": "off", "timezone": "CET"},
+    {"id": 4, "firstName": "David", "lastName": "Wilson", "alias": "dwilson", "status": "on", "timezone": "CET"},
+    {"id": 5, "firstName": "Sarah", "lastName": "Chen", "alias": "schen", "status": "on", "timezone": "CET"},
+    {"id": 6, "firstName": "Michael", "lastName": "Brown", "alias": "mbrown", "status": "off", "timezone": "PST"},
+    {"id": 7, "firstName": "Emma", "lastName": "Taylor", "alias": "etaylor", "status": "on", "timezone": "PST"}
+]
+
 @mcp.tool()
+@cached_tool(ttl=60)
 async def get_oncall_list(ctx: Context) -> str:
     """Get list of people currently on-call with their status and time zone.
 
     Returns:
         List of on-call personnel with their details
     """
-    oncall_list = [
-        {"id": 1, "firstName": "Julia", "lastName": "Smith", "alias": "jsmith", "status": "on", "timezone": "PST"},
-        {"id": 2, "firstName": "Alex", "lastName": "Johnson", "alias": "ajohnson", "status": "on", "timezone": "EST"},
-        {"id": 3, "firstName": "Maria", "lastName": "Garcia", "alias": "mgarcia", "status": "off", "timezone": "CET"},
-        {"id": 4, "firstName": "David", "lastName": "Wilson", "alias": "dwilson", "status": "on", "timezone": "CET"},
-        {"id": 5, "firstName": "Sarah", "lastName": "Chen", "alias": "schen", "status": "on", "timezone": "CET"},
-        {"id": 6, "firstName": "Michael", "lastName": "Brown", "alias": "mbrown", "status": "off", "timezone": "PST"},
-        {"id": 7, "firstName": "Emma", "lastName": "Taylor", "alias": "etaylor", "status": "on", "timezone": "PST"}
-    ]
-    
-    return str(oncall_list)
+    return encode_result(ONCALL_LIST)
+
+async def get_cache_stats(request: Request) -> JSONResponse:
+    """Hit/miss counters of the tool result cache."""
+    return JSONResponse(cache_stats())
 
 def create_starlette_app(mcp_server: Server, *, debug: bool = False) -> Starlette:
     """Create a Starlette application that can server the provied mcp server with SSE."""
@@ -52,6 +60,7 @@ def create_starlette_app(mcp_server: Server, *, debug: bool = False) -> Starlett
         debug=debug,
         routes=[
             Route("/oncall/sse", endpoint=handle_sse),
+            Route("/oncall/cache-stats", endpoint=get_cache_stats),
             Mount("/oncall/messages/", app=sse.handle_post_message),
         ],
     )
@@ -1,18 +1,20 @@
 import logging
+import uuid
 
 from a2a.server.agent_execution import AgentExecutor, RequestContext
 from a2a.server.events.event_queue import EventQueue
 from a2a.types import (
+    Artifact,
+    Part,
     TaskArtifactUpdateEvent,
     TaskState,
     TaskStatus,
     TaskStatusUpdateEvent,
+    TextPart,
 )
 from a2a.utils import (
     new_agent_text_message,
-    new_data_artifact,
     new_task,
-    new_text_artifact,
 )
 
 from a2a_agents import AbstractAgent
@@ -23,8 +25,26 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+def _result_artifact(artifact_id: str, text: str) -> Artifact:
+    """One chunk of the task result; all chunks of a task share the artifact id."""
+    return Artifact(
+        artifactId=artifact_id,
+        name='current_result',
+        description='Result of request to agent.',
+        parts=[Part(root=TextPart(text=text))],
+    )
+
+
 class A2ALabAgentExecutor(AgentExecutor):
-    """ Agent Executor """
+    """ Agent Executor
+
+    Message deltas of the agent (``is_delta``) are streamed to the client as
+    appended chunks of the result artifact while the model is still writing.
+    The validated final answer then replaces the artifact in a last chunk, so
+    clients that only read the completed task see the same result as before.
+    If the turn ends asking for user input instead (e.g. after a retry), the
+    streamed artifact is closed empty so no partial answer is left behind.
+    """
 
     def __init__(self, agent: AbstractAgent):
         super().__init__()
@@ -53,12 +73,36 @@ class A2ALabAgentExecutor(AgentExecutor):
             task = new_task(context.message)
             event_queue.enqueue_event(task)
 
+        artifact_id = str(uuid.uuid4())
+        streamed = False
+
         async for partial in self.agent.stream(query, task.contextId):
             require_input = partial['require_user_input']
             is_done = partial['is_task_complete']
             text_content = partial['content']
 
-            if require_input:
+            if partial.get('is_delta'):
+                event_queue.enqueue_event(
+                    TaskArtifactUpdateEvent(
+                        append=streamed,
+                        contextId=task.contextId,
+                        taskId=task.id,
+                        lastChunk=False,
+                        artifact=_result_artifact(artifact_id, text_content),
+                    )
+                )
+                streamed = True
+            elif require_input:
+                if streamed:
+                    event_queue.enqueue_event(
+                        TaskArtifactUpdateEvent(
+                            append=False,
+                            contextId=task.contextId,
+                            taskId=task.id,
+                            lastChunk=True,
+                            artifact=_result_artifact(artifact_id, ''),
+                        )
+                    )
                 event_queue.enqueue_event(
                     TaskStatusUpdateEvent(
                         status=TaskStatus(
@@ -81,11 +125,7 @@ class A2ALabAgentExecutor(AgentExecutor):
                         contextId=task.contextId,
                         taskId=task.id,
                         lastChunk=True,
-                        artifact=new_text_artifact(
-                            name='current_result',
-                            description='Result of request to agent.',
-                            text=text_content,
-                        ),
+                        artifact=_result_artifact(artifact_id, text_content),
                     )
                 )
                 event_queue.enqueue_event(
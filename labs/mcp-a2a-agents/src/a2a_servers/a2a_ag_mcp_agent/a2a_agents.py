@@ -41,7 +41,11 @@ import abc
 import asyncio
 import logging
 import random
-from collections.abc import AsyncIterable, Awaitable
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterable, AsyncIterator, Awaitable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
 from typing import Any, Callable, Literal, Optional, Union
 
 from pydantic import BaseModel
@@ -63,6 +67,9 @@ from autogen_ext.tools.mcp import (
     create_mcp_server_session,
 )
 from autogen_core import CancellationToken
+from autogen_core.model_context import UnboundedChatCompletionContext
+
+from message_deltas import MessageDeltas
 
 # ---------------------------------------------------------------------------
 logger = logging.getLogger(__name__)
@@ -103,9 +110,98 @@ class AbstractAgent(abc.ABC):
         ...
 
 
+# ---------------------------------------------------------------------------
+@dataclass
+class _Session:
+    """Model context of one A2A context; the lock serialises its turns."""
+    context: UnboundedChatCompletionContext = field(default_factory=UnboundedChatCompletionContext)
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    last_used: float = field(default_factory=time.monotonic)
+
+
+# ---------------------------------------------------------------------------
+class _SessionConnection:
+    """One pooled MCP session and the tools discovered on it.
+
+    The session is entered and exited by an owner task of its own, since the MCP
+    transports must be closed by the task that opened them. The connection is
+    dead as soon as that task ends.
+    """
+
+    def __init__(self, index: int):
+        self.index = index
+        self.session = None  # MCP client session
+        self.tools: list = []
+        self.in_use = 0
+        self.generation = 0  # bumped on every (re)connect
+        self.last_checked = 0.0
+        self.retry_at = 0.0  # no background reconnect before this time
+        self.lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+        self._close_event = asyncio.Event()
+
+    @property
+    def connected(self) -> bool:
+        return self.session is not None and self._task is not None and not self._task.done()
+
+    async def open(self, server_params: StreamableHttpServerParams):
+        ready: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._close_event = asyncio.Event()
+        self._task = asyncio.create_task(self._run(server_params, ready))
+        self.session = await ready
+        self.generation += 1
+        self.last_checked = time.monotonic()
+
+    async def _run(self, server_params: StreamableHttpServerParams, ready: asyncio.Future):
+        try:
+            async with create_mcp_server_session(server_params) as session:
+                await session.initialize()
+                ready.set_result(session)
+                await self._close_event.wait()
+        except Exception as ex:
+            if not ready.done():
+                ready.set_exception(ex)
+            else:
+                logger.warning("MCP connection %d dropped: %s", self.index, ex)
+        finally:
+            if not ready.done():
+                ready.cancel()
+
+    async def ping(self, timeout: float) -> bool:
+        try:
+            await asyncio.wait_for(self.session.send_ping(), timeout)
+            return True
+        except Exception as ex:
+            logger.warning("MCP connection %d failed its health check: %s", self.index, ex)
+            return False
+
+    async def close(self):
+        task, self._task = self._task, None
+        self.session = None
+        self.tools = []
+        if task is None:
+            return
+        self._close_event.set()
+        try:
+            await task
+        except Exception as err:
+            logger.debug("Session close failed: %s", err)
+
+
 # ---------------------------------------------------------------------------
 class AutoGenAgent(AbstractAgent):
-    """AutoGen agent that consumes an MCP Streamable endpoint."""
+    """AutoGen agent that consumes an MCP Streamable endpoint.
+
+    Every session id (A2A context) gets its own model context, kept in an LRU map
+    bounded to `max_sessions` and evicted after `session_idle_timeout` seconds
+    without use. Each turn runs on a fresh AssistantAgent built on that context, so
+    a reply to an input_required question continues the conversation that asked it.
+
+    Tool calls go through a pool of `pool_size` MCP sessions. A turn runs on the
+    least busy live session; one that has not been used for `health_check_after`
+    seconds is pinged first, after a failed attempt a dead session is reconnected,
+    and dead sessions are reconnected in the background while the others keep serving.
+    """
 
     def __init__(
         self,
@@ -125,6 +221,13 @@ class AutoGenAgent(AbstractAgent):
         max_attempts: int = 3,
         base_delay: float = 0.5,
         max_delay: float = 5.0,
+        # Conversations
+        max_sessions: int = 1000,
+        session_idle_timeout: float = 1800.0,
+        # Connection pool
+        pool_size: int = 4,
+        health_check_after: float = 30.0,
+        health_check_timeout: float = 5.0,
     ) -> None:
         self._server_params = StreamableHttpServerParams(url=mcp_url, headers=http_headers)
         self._title = title
@@ -139,13 +242,29 @@ class AutoGenAgent(AbstractAgent):
         self._base_delay = base_delay
         self._max_delay = max_delay
 
-        self._session = None  # MCP client session
-        self._agent: AssistantAgent | None = None
+        self._max_sessions = max_sessions
+        self._session_idle_timeout = session_idle_timeout
+        self._sessions: OrderedDict[str, _Session] = OrderedDict()
+
+        self._health_check_after = health_check_after
+        self._health_check_timeout = health_check_timeout
+        self._pool = [_SessionConnection(index) for index in range(max(1, pool_size))]
+        self._healing: set[asyncio.Task] = set()
 
     # ------------------------------------------------------------------ #
     # Context‑manager helpers
     async def __aenter__(self):
-        await self._open_session_and_agent()
+        self._prepare_model_client()
+        results = await asyncio.gather(
+            *(self._open_connection(conn) for conn in self._pool),
+            return_exceptions=True,
+        )
+        errors = [result for result in results if isinstance(result, BaseException)]
+        if len(errors) == len(self._pool):
+            raise errors[0]
+        for error in errors:
+            # Connections that failed now are reconnected in the background
+            logger.warning("MCP connection failed to open: %s", error)
         return self
 
     async def __aexit__(self, exc_type, exc, tb):
@@ -155,28 +274,45 @@ class AutoGenAgent(AbstractAgent):
     # ------------------------------------------------------------------ #
     # Public API
     async def invoke(self, user_input: str, session_id: str) -> dict[str, Any]:
-        async def _do():
-            token = CancellationToken()
-            result = await self._agent.run(task=user_input, cancellation_token=token)
-            return self._extract_response(result.messages[-1])
+        session = self._get_session(session_id)
 
-        return await self._retry("invoke", _do)
+        async with session.lock:
+            # Restored before every attempt, so a retry does not repeat the turn
+            state = await session.context.save_state()
+
+            async def _do(conn: _SessionConnection):
+                await session.context.load_state(state)
+                token = CancellationToken()
+                agent = self._build_agent(conn, session)
+                result = await agent.run(task=user_input, cancellation_token=token)
+                return self._extract_response(result.messages[-1])
+
+            return await self._retry("invoke", _do)
 
     async def stream(
         self, user_input: str, session_id: str
     ) -> AsyncIterable[dict[str, Any]]:
-        async def _generator():
+        session = self._get_session(session_id)
+
+        async def _generator(conn: _SessionConnection):
+            await session.context.load_state(state)
             token = CancellationToken()
-            async for event in self._agent.run_stream(
+            deltas = MessageDeltas()
+            agent = self._build_agent(conn, session)
+            async for event in agent.run_stream(
                 task=user_input, cancellation_token=token
             ):
                 # print(f"+++++++++++++++++++++++ {event.model_dump_json()}")
                 if isinstance(event, ModelClientStreamingChunkEvent):
-                    yield {
-                        "is_task_complete": False,
-                        "require_user_input": False,
-                        "content": event.delta or "…",
-                    }
+                    # Raw chunks are AgentResponse JSON; forward only the message text
+                    delta = deltas.feed(event.delta)
+                    if delta:
+                        yield {
+                            "is_task_complete": False,
+                            "require_user_input": False,
+                            "is_delta": True,
+                            "content": delta,
+                        }
                     continue
 
                 if isinstance(event, TextMessage):
@@ -188,7 +324,8 @@ class AutoGenAgent(AbstractAgent):
                     continue
 
                 if isinstance(event, (ToolCallRequestEvent, ToolCallExecutionEvent, ToolCallSummaryMessage)):
-                    # You can emit a progress ping here or just ignore it
+                    # The answer comes from the next model call (reflect_on_tool_use)
+                    deltas = MessageDeltas()
                     continue
 
                 if isinstance(event, StructuredMessage):
@@ -200,32 +337,51 @@ class AutoGenAgent(AbstractAgent):
                     return
 
 
-        async for item in self._retry_gen("stream", _generator):
-            yield item
+        async with session.lock:
+            state = await session.context.save_state()
+            async for item in self._retry_gen("stream", _generator):
+                yield item
 
     # ------------------------------------------------------------------ #
     # Retry helpers
     async def _retry(
-        self, name: str, coro_factory: Callable[[], Awaitable[Any]]
+        self, name: str, coro_factory: Callable[[_SessionConnection], Awaitable[Any]]
     ) -> Any:
-        for attempt in range(1, self._max_attempts + 1):
-            try:
-                return await coro_factory()
-            except Exception as ex:  # broad but logged
-                await self._backoff_or_raise(name, attempt, ex)
+        async with self._connection() as conn:
+            for attempt in range(1, self._max_attempts + 1):
+                generation = conn.generation
+                try:
+                    return await coro_factory(conn)
+                except Exception as ex:  # broad but logged
+                    await self._backoff_or_raise(name, attempt, ex, conn, generation)
 
     async def _retry_gen(
-        self, name: str, gen_factory: Callable[[], AsyncIterable[Any]]
+        self, name: str, gen_factory: Callable[[_SessionConnection], AsyncIterable[Any]]
     ) -> AsyncIterable[Any]:
-        for attempt in range(1, self._max_attempts + 1):
-            try:
-                async for item in gen_factory():
-                    yield item
-                return
-            except Exception as ex:
-                await self._backoff_or_raise(name, attempt, ex)
-
-    async def _backoff_or_raise(self, op_name: str, attempt: int, ex: Exception):
+        async with self._connection() as conn:
+            for attempt in range(1, self._max_attempts + 1):
+                generation = conn.generation
+                streamed = False
+                try:
+                    async for item in gen_factory(conn):
+                        streamed = streamed or item.get("is_delta", False)
+                        yield item
+                    return
+                except Exception as ex:
+                    if streamed:
+                        # Part of the answer already reached the client; a retry would repeat it
+                        logger.warning("%s: failed after streaming the answer had begun: %s", name, ex)
+                        raise
+                    await self._backoff_or_raise(name, attempt, ex, conn, generation)
+
+    async def _backoff_or_raise(
+        self,
+        op_name: str,
+        attempt: int,
+        ex: Exception,
+        conn: _SessionConnection,
+        generation: int,
+    ):
         logger.warning(
             "%s: transient error (attempt %d/%d): %s",
             op_name,
@@ -235,27 +391,104 @@ class AutoGenAgent(AbstractAgent):
         )
         if attempt == self._max_attempts:
             raise
+        # Errors are not all transport errors; reconnect only a session that is gone
+        await self._recover(conn, generation)
         delay = min(self._max_delay, self._base_delay * 2 ** (attempt - 1))
         delay *= random.uniform(0.8, 1.2)
         await asyncio.sleep(delay)
 
     # ------------------------------------------------------------------ #
     # ------------------------------------------------------------------ #
-    # Initialisation / teardown
-    async def _open_session_and_agent(self):
-        logger.info("Connecting to MCP server at %s…", self._server_params.url)
-
-        # The factory returns an *async context manager*, not the session itself.
-        # We have to keep a reference to it so we can close it later.
-        self._session_cm = create_mcp_server_session(self._server_params)
-        self._session = await self._session_cm.__aenter__()
-        await self._session.initialize()
+    # Connection pool
+    @asynccontextmanager
+    async def _connection(self) -> AsyncIterator[_SessionConnection]:
+        self._heal_dead_connections()
+        # Live connections first, least busy among them; a dead one only when none is live
+        conn = min(self._pool, key=lambda c: (not c.connected, c.in_use))
+        conn.in_use += 1
+        try:
+            await self._check_connection(conn)
+            yield conn
+            conn.last_checked = time.monotonic()
+        finally:
+            conn.in_use -= 1
+
+    async def _check_connection(self, conn: _SessionConnection):
+        async with conn.lock:
+            if conn.connected:
+                if time.monotonic() - conn.last_checked < self._health_check_after:
+                    return
+                if await conn.ping(self._health_check_timeout):
+                    conn.last_checked = time.monotonic()
+                    return
+            await self._open_connection(conn)
+
+    async def _recover(self, conn: _SessionConnection, generation: int):
+        async with conn.lock:
+            if conn.connected:
+                if conn.generation != generation:
+                    return  # another task has already reconnected it
+                if await conn.ping(self._health_check_timeout):
+                    return
+            await self._open_connection(conn)
+
+    def _heal_dead_connections(self):
+        """Reconnect dead, idle connections in the background, at most once per max_delay."""
+        now = time.monotonic()
+        for conn in self._pool:
+            if conn.connected or conn.lock.locked() or conn.retry_at > now:
+                continue
+            conn.retry_at = now + self._max_delay
+            task = asyncio.create_task(self._heal(conn))
+            self._healing.add(task)
+            task.add_done_callback(self._healing.discard)
+
+    async def _heal(self, conn: _SessionConnection):
+        async with conn.lock:
+            if conn.connected:
+                return
+            try:
+                await self._open_connection(conn)
+            except Exception as ex:
+                logger.warning("Reconnecting MCP session %d failed: %s", conn.index, ex)
 
-        tools = await mcp_server_tools(self._server_params, session=self._session)
-        for tool in tools:
-            tool._strict = True
-        logger.info("%d tools discovered.", len(tools))
+    # ------------------------------------------------------------------ #
+    # Sessions
+    def _get_session(self, session_id: str) -> _Session:
+        now = time.monotonic()
+        session = self._sessions.get(session_id)
+        if session is None:
+            session = _Session()
+            self._sessions[session_id] = session
+        self._sessions.move_to_end(session_id)
+        session.last_used = now
+
+        # Least recently used first; sessions with a turn in progress are kept
+        for old_id, old in list(self._sessions.items()):
+            if len(self._sessions) <= self._max_sessions and now - old.last_used <= self._session_idle_timeout:
+                break
+            if old.lock.locked() or old is session:
+                continue
+            del self._sessions[old_id]
+        return session
+
+    def _build_agent(self, conn: _SessionConnection, session: _Session) -> AssistantAgent:
+        return AssistantAgent(
+            name=self._title,
+            model_client=self._model_client,
+            tools=conn.tools,  # type: ignore[arg-type]
+            model_context=session.context,
+            output_content_type=AgentResponse,
+            reflect_on_tool_use=True,
+            model_client_stream=True,
+            system_message=(
+                f"You are a specialised assistant for {self._title}. "
+            ),
+        )
 
+    # ------------------------------------------------------------------ #
+    # Initialisation / teardown
+    def _prepare_model_client(self):
         if not self._model_client:
             self._model_client = OpenAIChatCompletionClient(
                 model=self._fallback_model_name,
@@ -265,23 +498,23 @@ class AutoGenAgent(AbstractAgent):
         else:
             self._model_client.response_format = AgentResponse  # type: ignore[attr-defined]
 
-        self._agent = AssistantAgent(
-            name=self._title,
-            model_client=self._model_client,
-            tools=tools,  # type: ignore[arg-type]
-            output_content_type=AgentResponse,
-            reflect_on_tool_use=True,
-            system_message=(
-                f"You are a specialised assistant for {self._title}. "
-            ),
-        )
+    async def _open_connection(self, conn: _SessionConnection):
+        logger.info("Connecting MCP session %d to %s…", conn.index, self._server_params.url)
+        await conn.close()
+        await conn.open(self._server_params)
+
+        tools = await mcp_server_tools(self._server_params, session=conn.session)
+        for tool in tools:
+            tool._strict = True
+        conn.tools = tools
+        logger.info("%d tools discovered on MCP session %d.", len(tools), conn.index)
 
     async def _close_everything(self, exc_type, exc, tb):
-        if getattr(self, "_session_cm", None):
-            await self._session_cm.__aexit__(exc_type, exc, tb)
-            self._session_cm = None
-            self._session = None
-        self._agent = None
+        for task in list(self._healing):
+            task.cancel()
+        await asyncio.gather(*self._healing, return_exceptions=True)
+        self._sessions.clear()
+        await asyncio.gather(*(conn.close() for conn in self._pool))
 
     def _extract_response(self, message):  # type: ignore[any-untyped-call]
         print(f"Final: {message}")
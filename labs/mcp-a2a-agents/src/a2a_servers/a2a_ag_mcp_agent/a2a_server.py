@@ -2,12 +2,15 @@ import logging
 import httpx
 
 from starlette.applications import Starlette     # A2A wraps Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
 from a2a.server.apps import A2AStarletteApplication
 from a2a.server.request_handlers import DefaultRequestHandler
-from a2a.server.tasks import InMemoryTaskStore, InMemoryPushNotifier
+from a2a.server.tasks import InMemoryPushNotifier
 from a2a.types import AgentCapabilities, AgentCard, AgentSkill
 
 from a2a_agent_exec import A2ALabAgentExecutor
+from task_store import BoundedTaskStore, SqliteTaskStore
 from a2a_agents import AutoGenAgent
 
 from autogen_ext.models.openai import AzureOpenAIChatCompletionClient
@@ -26,6 +29,9 @@ OPENAI_API_VERSION      = os.environ.get("OPENAI_API_VERSION", "2024-11-01-previ
 OPENAI_DEPLOYMENT_NAME  = os.environ.get("OPENAI_DEPLOYMENT_NAME", "gpt-4.1-mini")
 ACA_URL                 = f"https://{os.environ.get('CONTAINER_APP_NAME', '')}.{os.environ.get('CONTAINER_APP_ENV_DNS_SUFFIX', '')}"
 A2A_URL                 = os.environ.get("A2A_URL", ACA_URL)
+TASK_STORE_PATH         = os.environ.get("TASK_STORE_PATH", "")  # SQLite file; in-memory when empty
+TASK_STORE_MAX_ENTRIES  = int(os.environ.get("TASK_STORE_MAX_ENTRIES", "1000"))
+TASK_STORE_TTL          = float(os.environ.get("TASK_STORE_TTL", "3600"))
 
 
 def build_app(
@@ -61,9 +67,10 @@ def build_app(
 
     # -------- 3. Wire the executor into the default request handler ---
     httpx_client   = httpx.AsyncClient()
+    task_store     = _build_task_store()
     request_handler = DefaultRequestHandler(
         agent_executor = sk_agent_exec,
-        task_store     = InMemoryTaskStore(),
+        task_store     = task_store,
         push_notifier  = InMemoryPushNotifier(httpx_client),
     )
 
@@ -74,6 +81,11 @@ def build_app(
     )
     app: Starlette = server.build()
 
+    async def _task_store_stats(request: Request) -> JSONResponse:
+        return JSONResponse(await task_store.stats())
+
+    app.add_route("/task-store-stats", _task_store_stats, methods=["GET"])
+
     # -------- 5. Register lifecycle hooks to open/close the agent -----
     @app.on_event("startup")
     async def _startup() -> None:
@@ -87,10 +99,20 @@ def build_app(
         log.info("Closing SemanticKernelAgent Streamable connection …")
         await agent.__aexit__(None, None, None)
         await httpx_client.aclose()
+        if isinstance(task_store, SqliteTaskStore):
+            await task_store.close()
 
     return app
 
 
+# ========== Helper: pick the task store ================================
+def _build_task_store() -> BoundedTaskStore | SqliteTaskStore:
+    if TASK_STORE_PATH:
+        log.info("Persisting tasks to %s", TASK_STORE_PATH)
+        return SqliteTaskStore(TASK_STORE_PATH, TASK_STORE_MAX_ENTRIES, TASK_STORE_TTL)
+    return BoundedTaskStore(TASK_STORE_MAX_ENTRIES, TASK_STORE_TTL)
+
+
 # ========== Helper: build the agent-card sent to A2A clients ===========
 def _get_agent_card(host_url: str) -> AgentCard:
     capabilities = AgentCapabilities(streaming=True)
@@ -5,7 +5,11 @@ import abc
 import asyncio
 import logging
 import random
-from collections.abc import AsyncIterable
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterable, AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, Any, Callable, Literal
 
 from pydantic import BaseModel
@@ -21,11 +25,12 @@ from semantic_kernel.connectors.mcp import MCPStreamableHttpPlugin
 from semantic_kernel.contents import (
     FunctionCallContent,
     FunctionResultContent,
-    StreamingChatMessageContent,
     StreamingTextContent,
 )
 from semantic_kernel.functions.kernel_arguments import KernelArguments
 
+from message_deltas import MessageDeltas
+
 # websockets errors bubbled up by MCPStreamableHttpPlugin
 from websockets.exceptions import ConnectionClosedError, ConnectionClosedOK
 
@@ -58,9 +63,98 @@ class AbstractAgent(abc.ABC):
         ...
 
 
+# ──────────────────────────────────────────────────────────────────────────
+@dataclass
+class _Session:
+    """Chat history of one A2A context; the lock serialises its turns."""
+    thread: ChatHistoryAgentThread
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    last_used: float = field(default_factory=time.monotonic)
+
+
+# ──────────────────────────────────────────────────────────────────────────
+class _PluginConnection:
+    """One pooled MCP connection and the agent bound to its plugin.
+
+    The plugin is entered and exited by an owner task of its own, since the MCP
+    transports must be closed by the task that opened them. The connection is
+    dead as soon as that task ends.
+    """
+
+    def __init__(self, index: int):
+        self.index = index
+        self.plugin: MCPStreamableHttpPlugin | None = None
+        self.agent: ChatCompletionAgent | None = None
+        self.in_use = 0
+        self.generation = 0      # bumped on every (re)connect
+        self.last_checked = 0.0
+        self.retry_at = 0.0      # no background reconnect before this time
+        self.lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+        self._close_event = asyncio.Event()
+
+    @property
+    def connected(self) -> bool:
+        return self.plugin is not None and self._task is not None and not self._task.done()
+
+    async def open(self, plugin: MCPStreamableHttpPlugin):
+        ready: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._close_event = asyncio.Event()
+        self._task = asyncio.create_task(self._run(plugin, ready))
+        await ready
+        self.plugin = plugin
+        self.generation += 1
+        self.last_checked = time.monotonic()
+
+    async def _run(self, plugin: MCPStreamableHttpPlugin, ready: asyncio.Future):
+        try:
+            async with plugin:
+                ready.set_result(None)
+                await self._close_event.wait()
+        except Exception as ex:
+            if not ready.done():
+                ready.set_exception(ex)
+            else:
+                logger.warning("MCP connection %d dropped: %s", self.index, ex)
+        finally:
+            if not ready.done():
+                ready.cancel()
+
+    async def ping(self, timeout: float) -> bool:
+        try:
+            await asyncio.wait_for(self.plugin.session.send_ping(), timeout)  # type: ignore[union-attr]
+            return True
+        except Exception as ex:
+            logger.warning("MCP connection %d failed its health check: %s", self.index, ex)
+            return False
+
+    async def close(self):
+        task, self._task = self._task, None
+        self.plugin = None
+        self.agent = None
+        if task is None:
+            return
+        self._close_event.set()
+        try:
+            await task
+        except Exception as err:
+            logger.debug("Plugin close failed: %s", err)
+
+
 # ──────────────────────────────────────────────────────────────────────────
 class SemanticKernelAgent(AbstractAgent):
-    """Semantic-Kernel agent with automatic SSE reconnect + retries."""
+    """Semantic-Kernel agent with automatic SSE reconnect + retries.
+
+    Every session id (A2A context) gets its own chat thread, kept in an LRU map
+    bounded to `max_sessions` and evicted after `session_idle_timeout` seconds
+    without use, so concurrent contexts neither share nor reset each other's history.
+
+    Tool calls go through a pool of `pool_size` MCP connections, each with its own
+    plugin and agent. A turn runs on the least busy live connection; one that has not
+    been used for `health_check_after` seconds is pinged first, a dropped connection
+    is reconnected on its own, and dead connections are reconnected in the background
+    while the other connections keep serving.
+    """
 
     # ------------------------------------------------------------------ #
     # Construction / context-manager
@@ -74,6 +168,11 @@ class SemanticKernelAgent(AbstractAgent):
         max_attempts: int = 3,
         base_delay: float = 0.5,
         max_delay: float = 5.0,
+        max_sessions: int = 1000,
+        session_idle_timeout: float = 1800.0,
+        pool_size: int = 4,
+        health_check_after: float = 30.0,
+        health_check_timeout: float = 5.0,
     ):
         self._mcp_url = mcp_url.rstrip("/")
         self._title = title
@@ -83,12 +182,26 @@ class SemanticKernelAgent(AbstractAgent):
         self._base_delay = base_delay
         self._max_delay = max_delay
 
-        self.mcp_plugin: MCPStreamableHttpPlugin | None = None
-        self.agent: ChatCompletionAgent | None = None
-        self.thread: ChatHistoryAgentThread | None = None
+        self._max_sessions = max_sessions
+        self._session_idle_timeout = session_idle_timeout
+        self._sessions: OrderedDict[str, _Session] = OrderedDict()
+
+        self._health_check_after = health_check_after
+        self._health_check_timeout = health_check_timeout
+        self._pool = [_PluginConnection(index) for index in range(max(1, pool_size))]
+        self._healing: set[asyncio.Task] = set()
 
     async def __aenter__(self):
-        await self._open_plugin_and_agent()
+        results = await asyncio.gather(
+            *(self._open_connection(conn) for conn in self._pool),
+            return_exceptions=True,
+        )
+        errors = [result for result in results if isinstance(result, BaseException)]
+        if len(errors) == len(self._pool):
+            raise errors[0]
+        for error in errors:
+            # Connections that failed now are reconnected in the background
+            logger.warning("MCP connection failed to open: %s", error)
         return self
 
     async def __aexit__(self, exc_type, exc, tb):
@@ -101,27 +214,30 @@ class SemanticKernelAgent(AbstractAgent):
     async def invoke(
         self, user_input: str, session_id: str
     ) -> dict[str, Any]:
-        await self._ensure_thread_exists(session_id)
+        session = await self._get_session(session_id)
 
-        async def _call():
-            response = await self.agent.get_response(  # type: ignore[union-attr]
+        async def _call(conn: _PluginConnection):
+            response = await conn.agent.get_response(  # type: ignore[union-attr]
                 messages=user_input,
-                thread=self.thread,
+                thread=session.thread,
             )
-            return self._get_agent_response(response.content)
+            return self._get_agent_response(response.content.content)
 
-        return await self._retry_coro("invoke", _call)
+        async with session.lock:
+            return await self._retry_coro("invoke", _call)
 
     async def stream(
         self, user_input: str, session_id: str
     ) -> AsyncIterable[dict[str, Any]]:
-        await self._ensure_thread_exists(session_id)
+        session = await self._get_session(session_id)
 
-        async def _stream_call():
+        async def _stream_call(conn: _PluginConnection):
             plugin_notice_seen = False
             plugin_event = asyncio.Event()
-            text_notice_seen = False
-            chunks: list[StreamingChatMessageContent] = []
+            # Text is collected in a list and joined once; adding message
+            # objects chunk by chunk is quadratic in the answer length
+            text_parts: list[str] = []
+            deltas = MessageDeltas()
 
             async def _handle_intermediate(message: "ChatMessageContent"):
                 nonlocal plugin_notice_seen
@@ -134,9 +250,9 @@ class SemanticKernelAgent(AbstractAgent):
                     elif isinstance(item, FunctionCallContent):
                         logger.debug("Function call %s", item.name)
 
-            async for chunk in self.agent.invoke_stream(  # type: ignore[union-attr]
+            async for chunk in conn.agent.invoke_stream(  # type: ignore[union-attr]
                 messages=user_input,
-                thread=self.thread,
+                thread=session.thread,
                 on_intermediate_message=_handle_intermediate,
             ):
                 if plugin_event.is_set():
@@ -147,42 +263,65 @@ class SemanticKernelAgent(AbstractAgent):
                     }
                     plugin_event.clear()
 
-                if any(isinstance(i, StreamingTextContent) for i in chunk.items):
-                    if not text_notice_seen:
+                text = "".join(
+                    item.text for item in chunk.items
+                    if isinstance(item, StreamingTextContent) and item.text
+                )
+                if text:
+                    text_parts.append(text)
+                    delta = deltas.feed(text)
+                    if delta:
                         yield {
                             "is_task_complete": False,
                             "require_user_input": False,
-                            "content": "Building the output…",
+                            "is_delta": True,
+                            "content": delta,
                         }
-                        text_notice_seen = True
-                    chunks.append(chunk.message)
 
-            if chunks:
-                yield self._get_agent_response(sum(chunks[1:], chunks[0]))
+            if text_parts:
+                yield self._get_agent_response("".join(text_parts))
 
-        async for item in self._retry_gen("stream", _stream_call):
-            yield item
+        async with session.lock:
+            async for item in self._retry_gen("stream", _stream_call):
+                yield item
 
     # ------------------------------------------------------------------ #
     # Retry helpers (separate for coro vs generator)
     # ------------------------------------------------------------------ #
-    async def _retry_coro(self, op_name: str, factory: Callable[[], Any]):
-        for attempt in range(1, self._max_attempts + 1):
-            try:
-                return await factory()
-            except (ConnectionClosedError, ConnectionClosedOK) as ex:
-                await self._backoff_or_raise(op_name, attempt, ex)
-
-    async def _retry_gen(self, op_name: str, factory: Callable[[], Any]):
-        for attempt in range(1, self._max_attempts + 1):
-            try:
-                async for item in factory():
-                    yield item
-                return
-            except (ConnectionClosedError, ConnectionClosedOK) as ex:
-                await self._backoff_or_raise(op_name, attempt, ex)
-
-    async def _backoff_or_raise(self, op_name: str, attempt: int, ex: Exception):
+    async def _retry_coro(self, op_name: str, factory: Callable[[_PluginConnection], Any]):
+        async with self._connection() as conn:
+            for attempt in range(1, self._max_attempts + 1):
+                generation = conn.generation
+                try:
+                    return await factory(conn)
+                except (ConnectionClosedError, ConnectionClosedOK) as ex:
+                    await self._backoff_or_raise(op_name, attempt, ex, conn, generation)
+
+    async def _retry_gen(self, op_name: str, factory: Callable[[_PluginConnection], Any]):
+        async with self._connection() as conn:
+            for attempt in range(1, self._max_attempts + 1):
+                generation = conn.generation
+                streamed = False
+                try:
+                    async for item in factory(conn):
+                        streamed = streamed or item.get("is_delta", False)
+                        yield item
+                    return
+                except (ConnectionClosedError, ConnectionClosedOK) as ex:
+                    if streamed:
+                        # Part of the answer already reached the client; a retry would repeat it
+                        logger.warning("%s: SSE dropped after streaming the answer had begun: %s", op_name, ex)
+                        raise
+                    await self._backoff_or_raise(op_name, attempt, ex, conn, generation)
+
+    async def _backoff_or_raise(
+        self,
+        op_name: str,
+        attempt: int,
+        ex: Exception,
+        conn: _PluginConnection,
+        generation: int,
+    ):
         logger.warning(
             "%s: SSE dropped (attempt %d/%d): %s",
             op_name,
@@ -192,68 +331,129 @@ class SemanticKernelAgent(AbstractAgent):
         )
         if attempt == self._max_attempts:
             raise
-        await self._reconnect_plugin()
+        await self._reconnect(conn, generation)
         delay = min(self._max_delay, self._base_delay * 2 ** (attempt - 1))
         delay *= random.uniform(0.8, 1.2)  # jitter
         await asyncio.sleep(delay)
 
     # ------------------------------------------------------------------ #
-    # Plugin / agent (re)initialisation
+    # Connection pool / agent (re)initialisation
     # ------------------------------------------------------------------ #
-    async def _reconnect_plugin(self):
-        logger.info("Reconnecting MCPSsePlugin for %s…", self._title)
-        await self._close_everything(None, None, None)
-        await self._open_plugin_and_agent()
-
-    async def _open_plugin_and_agent(self):
-        self.mcp_plugin = MCPStreamableHttpPlugin(
+    @asynccontextmanager
+    async def _connection(self) -> AsyncIterator[_PluginConnection]:
+        self._heal_dead_connections()
+        # Live connections first, least busy among them; a dead one only when none is live
+        conn = min(self._pool, key=lambda c: (not c.connected, c.in_use))
+        conn.in_use += 1
+        try:
+            await self._check_connection(conn)
+            yield conn
+            conn.last_checked = time.monotonic()
+        finally:
+            conn.in_use -= 1
+
+    async def _check_connection(self, conn: _PluginConnection):
+        async with conn.lock:
+            if conn.connected:
+                if time.monotonic() - conn.last_checked < self._health_check_after:
+                    return
+                if await conn.ping(self._health_check_timeout):
+                    conn.last_checked = time.monotonic()
+                    return
+            await self._open_connection(conn)
+
+    def _heal_dead_connections(self):
+        """Reconnect dead, idle connections in the background, at most once per max_delay."""
+        now = time.monotonic()
+        for conn in self._pool:
+            if conn.connected or conn.lock.locked() or conn.retry_at > now:
+                continue
+            conn.retry_at = now + self._max_delay
+            task = asyncio.create_task(self._heal(conn))
+            self._healing.add(task)
+            task.add_done_callback(self._healing.discard)
+
+    async def _heal(self, conn: _PluginConnection):
+        async with conn.lock:
+            if conn.connected:
+                return
+            try:
+                await self._open_connection(conn)
+            except Exception as ex:
+                logger.warning("Reconnecting MCP plugin %d failed: %s", conn.index, ex)
+
+    async def _reconnect(self, conn: _PluginConnection, generation: int):
+        async with conn.lock:
+            if conn.connected and conn.generation != generation:
+                return  # another task has already reconnected it
+            await self._open_connection(conn)
+
+    async def _open_connection(self, conn: _PluginConnection):
+        logger.info("Connecting MCP plugin %d for %s…", conn.index, self._title)
+        # Session threads survive a reconnect; only this plugin and its agent are rebuilt
+        await conn.close()
+        plugin = MCPStreamableHttpPlugin(
             name=self._title,
             url=self._mcp_url,
             description=f"{self._title} Plugin",
         )
-        await self.mcp_plugin.__aenter__()
+        await conn.open(plugin)
 
-        self.agent = ChatCompletionAgent(
+        conn.agent = ChatCompletionAgent(
             service=self._oai_client,
             name=f"{self._title}_agent",
             instructions=f"You are a helpful assistant for {self._title}.",
-            plugins=[self.mcp_plugin],
+            plugins=[plugin],
             arguments=KernelArguments(
                 settings=OpenAIChatPromptExecutionSettings(
                     response_format=AgentResponse,
                 )
             ),
         )
-        logger.info("MCPSsePlugin connected (%s).", self._title)
+        logger.info("MCP plugin %d connected (%s).", conn.index, self._title)
 
     async def _close_everything(self, exc_type, exc, tb):
-        if self.thread:
-            try:
-                await self.thread.delete()
-            except Exception as err:
-                logger.debug("Thread delete failed: %s", err)
-            self.thread = None
+        for task in list(self._healing):
+            task.cancel()
+        await asyncio.gather(*self._healing, return_exceptions=True)
 
-        if self.mcp_plugin:
-            try:
-                await self.mcp_plugin.__aexit__(exc_type, exc, tb)
-            except Exception as err:
-                logger.debug("Plugin close failed: %s", err)
-            self.mcp_plugin = None
-            self.agent = None
+        while self._sessions:
+            _, session = self._sessions.popitem()
+            await self._delete_thread(session.thread)
+
+        await asyncio.gather(*(conn.close() for conn in self._pool))
 
     # ------------------------------------------------------------------ #
     # Utility helpers
     # ------------------------------------------------------------------ #
-    async def _ensure_thread_exists(self, session_id: str):
-        if self.thread is None or self.thread.id != session_id:
-            if self.thread:
-                await self.thread.delete()
-            self.thread = ChatHistoryAgentThread(thread_id=session_id)
+    async def _get_session(self, session_id: str) -> _Session:
+        now = time.monotonic()
+        session = self._sessions.get(session_id)
+        if session is None:
+            session = _Session(ChatHistoryAgentThread(thread_id=session_id))
+            self._sessions[session_id] = session
+        self._sessions.move_to_end(session_id)
+        session.last_used = now
+
+        # Least recently used first; sessions with a turn in progress are kept
+        for old_id, old in list(self._sessions.items()):
+            if len(self._sessions) <= self._max_sessions and now - old.last_used <= self._session_idle_timeout:
+                break
+            if old.lock.locked() or old is session:
+                continue
+            del self._sessions[old_id]
+            await self._delete_thread(old.thread)
+        return session
+
+    async def _delete_thread(self, thread: ChatHistoryAgentThread):
+        try:
+            await thread.delete()
+        except Exception as err:
+            logger.debug("Thread delete failed: %s", err)
 
-    def _get_agent_response(self, message: "ChatMessageContent") -> dict[str, Any]:
+    def _get_agent_response(self, text: str) -> dict[str, Any]:
         try:
-            structured = AgentResponse.model_validate_json(message.content)
+            structured = AgentResponse.model_validate_json(text)
         except Exception:
             return {
                 "is_task_complete": False,
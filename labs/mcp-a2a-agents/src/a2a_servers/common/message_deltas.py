@@ -0,0 +1,67 @@
+"""Streams the answer text out of the AgentResponse JSON written by the model."""
+
+import json
+import re
+
+
+class MessageDeltas:
+    """Incrementally extracts the "message" field of the streamed AgentResponse JSON.
+
+    feed() takes the next raw chunk and returns the newly decoded message text, so
+    deltas can be forwarded while the model is still writing the JSON object.
+    Only a "completed" answer is streamed: the status has to be written before the
+    message, otherwise nothing is returned and the caller relies on the final response.
+    """
+
+    _MESSAGE_KEY = re.compile(r'"message"\s*:\s*"')
+    _COMPLETED = re.compile(r'"status"\s*:\s*"completed"')
+
+    def __init__(self):
+        self._state = "seek"      # seek → message → done
+        self._pending = ""        # raw text before the message value starts
+        self._escape = ""         # incomplete escape sequence
+
+    def feed(self, text: str) -> str:
+        if self._state == "seek":
+            self._pending += text
+            match = self._MESSAGE_KEY.search(self._pending)
+            if not match:
+                return ""
+            completed = self._COMPLETED.search(self._pending, 0, match.start())
+            text = self._pending[match.end():]
+            self._pending = ""
+            self._state = "message" if completed else "done"
+        if self._state != "message":
+            return ""
+
+        out = []
+        for ch in text:
+            if self._escape:
+                self._escape += ch
+                if self._escape_incomplete():
+                    continue
+                try:
+                    out.append(json.loads(f'"{self._escape}"'))
+                except ValueError:
+                    pass
+                self._escape = ""
+            elif ch == "\\":
+                self._escape = ch
+            elif ch == '"':
+                self._state = "done"
+                break
+            else:
+                out.append(ch)
+        return "".join(out)
+
+    def _escape_incomplete(self) -> bool:
+        if not self._escape.startswith("\\u"):
+            return False
+        if len(self._escape) < 6:
+            return True
+        # A high surrogate needs its low surrogate (\uXXXX\uXXXX) to decode
+        try:
+            high = 0xD800 <= int(self._escape[2:6], 16) <= 0xDBFF
+        except ValueError:
+            return False
+        return high and len(self._escape) < 12
@@ -0,0 +1,295 @@
+import asyncio
+import logging
+import sqlite3
+import time
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from itertools import islice
+
+from a2a.server.tasks import TaskStore
+from a2a.types import Task, TaskState
+from typing_extensions import override
+
+
+logger = logging.getLogger(__name__)
+
+# States in which a task no longer changes; these are stored compressed
+TERMINAL_STATES = {
+    TaskState.completed,
+    TaskState.canceled,
+    TaskState.failed,
+    TaskState.rejected,
+}
+
+
+def _is_terminal(task: Task) -> bool:
+    return task.status.state in TERMINAL_STATES
+
+
+def _encode(task: Task) -> bytes:
+    data = task.model_dump_json(exclude_none=True).encode()
+    return zlib.compress(data) if _is_terminal(task) else data
+
+
+def _decode(data: bytes, compressed: bool) -> Task:
+    return Task.model_validate_json(zlib.decompress(data) if compressed else data)
+
+
+@dataclass
+class _Entry:
+    task: Task | None      # live object of an active task
+    data: bytes | None     # compressed JSON of a terminal task
+    size: int              # bytes of `data`; active tasks are measured in stats()
+    updated: float
+
+
+class BoundedTaskStore(TaskStore):
+    """In-memory task store with max-entries and TTL eviction.
+
+    Tasks not saved for `ttl` seconds expire. Beyond `max_entries` the least
+    recently saved tasks are evicted, finished ones before active ones. Finished
+    tasks are kept as compressed JSON and only decoded again on get().
+    """
+
+    def __init__(self, max_entries: int = 1000, ttl: float = 3600.0):
+        self._max_entries = max_entries
+        self._ttl = ttl
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._bytes = 0
+        self._evicted = 0
+        self._lock = asyncio.Lock()
+
+    @override
+    async def save(self, task: Task):
+        async with self._lock:
+            now = time.monotonic()
+            self._remove(task.id)
+            if _is_terminal(task):
+                data = _encode(task)
+                entry = _Entry(None, data, len(data), now)
+            else:
+                # Active tasks are saved on every streamed chunk; serialising the
+                # growing task each time just to size it would be quadratic
+                entry = _Entry(task, None, 0, now)
+            self._entries[task.id] = entry
+            self._bytes += entry.size
+            self._evict(now)
+
+    @override
+    async def get(self, task_id: str) -> Task | None:
+        async with self._lock:
+            entry = self._entries.get(task_id)
+            if entry is None:
+                return None
+            if time.monotonic() - entry.updated > self._ttl:
+                self._remove(task_id)
+                self._evicted += 1
+                return None
+            return entry.task if entry.data is None else _decode(entry.data, True)
+
+    @override
+    async def delete(self, task_id: str):
+        async with self._lock:
+            self._remove(task_id)
+
+    async def stats(self) -> dict[str, int]:
+        """Gauges: stored, active and finished tasks, approximate bytes, evictions."""
+        async with self._lock:
+            active = [entry.task for entry in self._entries.values() if entry.data is None]
+        active_bytes = sum(len(task.model_dump_json(exclude_none=True)) for task in active)
+        return {
+            "tasks": len(self._entries),
+            "active": len(active),
+            "finished": len(self._entries) - len(active),
+            "bytes": self._bytes + active_bytes,
+            "evicted": self._evicted,
+        }
+
+    def _remove(self, task_id: str):
+        entry = self._entries.pop(task_id, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    def _evict(self, now: float):
+        # Entries are ordered by last save, so expired ones are at the front
+        while self._entries:
+            task_id, entry = next(iter(self._entries.items()))
+            if now - entry.updated <= self._ttl:
+                break
+            self._remove(task_id)
+            self._evicted += 1
+
+        excess = len(self._entries) - self._max_entries
+        if excess <= 0:
+            return
+        finished = list(islice(
+            (task_id for task_id, entry in self._entries.items() if entry.data is not None),
+            excess,
+        ))
+        for task_id in finished:
+            self._remove(task_id)
+        self._evicted += len(finished)
+        while len(self._entries) > self._max_entries:
+            task_id = next(iter(self._entries))
+            self._remove(task_id)
+            self._evicted += 1
+            logger.warning("Task store full; evicted active task %s", task_id)
+
+
+class SqliteTaskStore(TaskStore):
+    """SQLite-backed task store, so tasks survive a restart of the server.
+
+    Same eviction and compression as BoundedTaskStore; TTLs use wall-clock time.
+    Queries run in a worker thread, one at a time. Active tasks are saved on every
+    streamed chunk, so while their state is unchanged they are written at most once
+    per `flush_interval` seconds; the latest version is kept in memory until then.
+    Status changes and finished tasks are written at once.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_entries: int = 1000,
+        ttl: float = 3600.0,
+        flush_interval: float = 1.0,
+    ):
+        self._max_entries = max_entries
+        self._ttl = ttl
+        self._flush_interval = flush_interval
+        self._evicted = 0
+        self._lock = asyncio.Lock()
+        # task id -> (task, time it became pending) of active tasks not written yet
+        self._pending: OrderedDict[str, tuple[Task, float]] = OrderedDict()
+        # task id -> (state, time) of the last write of each active task
+        self._written: OrderedDict[str, tuple[TaskState, float]] = OrderedDict()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        # WAL stays consistent with NORMAL; at worst the last commits are lost on power failure
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS tasks ("
+            " id TEXT PRIMARY KEY,"
+            " finished INTEGER NOT NULL,"
+            " updated REAL NOT NULL,"
+            " data BLOB NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS tasks_updated ON tasks (updated)")
+        self._db.commit()
+
+    @override
+    async def save(self, task: Task):
+        now = time.monotonic()
+        written = self._written.get(task.id)
+        if (
+            not _is_terminal(task)
+            and written is not None
+            and written[0] == task.status.state
+            and now - written[1] < self._flush_interval
+        ):
+            previous = self._pending.get(task.id)
+            self._pending[task.id] = (task, previous[1] if previous else now)
+            return
+
+        self._pending.pop(task.id, None)
+        tasks = [task, *self._due(now)]
+        await self._run(self._save, tasks)
+        for saved in tasks:
+            self._written.pop(saved.id, None)
+            if not _is_terminal(saved):
+                self._written[saved.id] = (saved.status.state, now)
+        # Forget active tasks that stopped being saved without finishing
+        while self._written:
+            task_id, (_, written_at) = next(iter(self._written.items()))
+            if now - written_at <= self._ttl:
+                break
+            del self._written[task_id]
+
+    @override
+    async def get(self, task_id: str) -> Task | None:
+        pending = self._pending.get(task_id)
+        if pending is not None:
+            return pending[0]
+        row = await self._run(self._get, task_id)
+        return _decode(row[1], bool(row[0])) if row else None
+
+    @override
+    async def delete(self, task_id: str):
+        self._pending.pop(task_id, None)
+        self._written.pop(task_id, None)
+        await self._run(self._delete, task_id)
+
+    async def stats(self) -> dict[str, int]:
+        """Gauges: stored, active and finished tasks, database bytes, evictions."""
+        return await self._run(self._stats)
+
+    async def close(self):
+        """Write the pending tasks and close the database."""
+        pending = [task for task, _ in self._pending.values()]
+        self._pending.clear()
+        await self._run(self._close, pending)
+
+    def _due(self, now: float) -> list[Task]:
+        """Pop the pending tasks that have waited for `flush_interval` seconds."""
+        due = []
+        while self._pending:
+            task_id, (task, pending_since) = next(iter(self._pending.items()))
+            if now - pending_since < self._flush_interval:
+                break
+            del self._pending[task_id]
+            due.append(task)
+        return due
+
+    async def _run(self, func, *args):
+        async with self._lock:
+            return await asyncio.to_thread(func, *args)
+
+    def _save(self, tasks: list[Task]):
+        now = time.time()
+        with self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO tasks (id, finished, updated, data) VALUES (?, ?, ?, ?)",
+                [(task.id, int(_is_terminal(task)), now, _encode(task)) for task in tasks],
+            )
+            self._evict(now)
+
+    def _stats(self) -> dict[str, int]:
+        tasks, finished = self._db.execute(
+            "SELECT COUNT(*), COALESCE(SUM(finished), 0) FROM tasks"
+        ).fetchone()
+        page_count = self._db.execute("PRAGMA page_count").fetchone()[0]
+        page_size = self._db.execute("PRAGMA page_size").fetchone()[0]
+        return {
+            "tasks": tasks,
+            "active": tasks - finished,
+            "finished": finished,
+            "bytes": page_count * page_size,
+            "evicted": self._evicted,
+        }
+
+    def _close(self, pending: list[Task]):
+        if pending:
+            self._save(pending)
+        self._db.close()
+
+    def _get(self, task_id: str):
+        return self._db.execute(
+            "SELECT finished, data FROM tasks WHERE id = ? AND updated >= ?",
+            (task_id, time.time() - self._ttl),
+        ).fetchone()
+
+    def _delete(self, task_id: str):
+        with self._db:
+            self._db.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
+
+    def _evict(self, now: float):
+        evicted = self._db.execute("DELETE FROM tasks WHERE updated < ?", (now - self._ttl,)).rowcount
+        excess = self._db.execute("SELECT COUNT(*) FROM tasks").fetchone()[0] - self._max_entries
+        if excess > 0:
+            # Finished tasks first, then the least recently saved
+            evicted += self._db.execute(
+                "DELETE FROM tasks WHERE id IN"
+                " (SELECT id FROM tasks ORDER BY finished DESC, updated LIMIT ?)",
+                (excess,),
+            ).rowcount
+        self._evicted += evicted
@@ -4,55 +4,63 @@ from mcp.server.fastmcp import FastMCP, Context
 from starlette.applications import Starlette
 from mcp.server.sse import SseServerTransport
 from starlette.requests import Request
+from starlette.responses import JSONResponse
 from starlette.routing import Mount, Route
 from mcp.server import Server
 import uvicorn
+from result_encoder import encode_result
+from tool_cache import cached_tool, cache_stats
 
 # Initialize FastMCP server for Weather API
 mcp = FastMCP("Weather")
 
+CITIES_BY_COUNTRY = {
+    "usa": ["New York", "Los Angeles", "Chicago", "Houston", "Phoenix"],
+    "canada": ["Toronto", "Vancouver", "Montreal", "Calgary", "Ottawa"],
+    "uk": ["London", "Manchester", "Birmingham", "Leeds", "Glasgow"],
+    "australia": ["Sydney", "Melbourne", "Brisbane", "Perth", "Adelaide"],
+    "india": ["Mumbai", "Delhi", "Bangalore", "Hyderabad", "Chennai"],
+    "portugal": ["Lisbon", "Porto", "Braga", "Faro", "Coimbra"]
+}
+WEATHER_CONDITIONS = ["Sunny", "Cloudy", "Rainy", "Snowy", "Windy"]
+
 
 @mcp.tool()
+@cached_tool(ttl=3600)
 async def get_cities(ctx: Context, country: str) -> str:
     """Get list of cities for a given country.
 
     Returns:
         List of cities
     """
-    cities_by_country = {
-        "usa": ["New York", "Los Angeles", "Chicago", "Houston", "Phoenix"],
-        "canada": ["Toronto", "Vancouver", "Montreal", "Calgary", "Ottawa"],
-        "uk": ["London", "Manchester", "Birmingham", "Leeds", "Glasgow"],
-        "australia": ["Sydney", "Melbourne", "Brisbane", "Perth", "Adelaide"],
-        "india": ["Mumbai", "Delhi", "Bangalore", "Hyderabad", "Chennai"],
-        "portugal": ["Lisbon", "Porto", "Braga", "Faro", "Coimbra"]
-    }
-
-    cities = cities_by_country.get(country.lower(), [])
+    cities = CITIES_BY_COUNTRY.get(country.lower(), [])
 
-    return str(cities)
+    return encode_result(cities)
 
 @mcp.tool()
+@cached_tool(ttl=60)
 async def get_weather(ctx: Context, city: str) -> str:
     """Get weather information for a given city.
 
     Returns:
         Weather information
     """
-
-    weather_conditions = ["Sunny", "Cloudy", "Rainy", "Snowy", "Windy"]
     temperature = random.uniform(-10, 35)  # Random temperature between -10 and 35 degrees Celsius
     humidity = random.uniform(20, 100)  # Random humidity between 20% and 100%
 
     weather_info = {
         "city": city,
-        "condition": random.choice(weather_conditions),
+        "condition": random.choice(WEATHER_CONDITIONS),
         "temperature": round(temperature, 2),
         "humidity": round(humidity, 2),
     }
-    return str(weather_info)
+    return encode_result(weather_info)
     
 
+async def get_cache_stats(request: Request) -> JSONResponse:
+    """Hit/miss counters of the tool result cache."""
+    return JSONResponse(cache_stats())
+
 def create_starlette_app(mcp_server: Server, *, debug: bool = False) -> Starlette:
     """Create a Starlette application that can server the provied mcp server with SSE."""
     sse = SseServerTransport("/weather/messages/")
@@ -75,6 +83,7 @@ def create_starlette_app(mcp_server: Server, *, debug: bool = False) -> Starlett
         debug=debug,
         routes=[
             Route("/weather/sse", endpoint=handle_sse),
+            Route("/weather/cache-stats", endpoint=get_cache_stats),
             Mount("/weather/messages/", app=sse.handle_post_message),
         ],
     )
@@ -2,6 +2,7 @@
 
 import argparse, random
 from fastmcp import FastMCP
+from result_encoder import encode_result
 
 mcp = FastMCP(name="weather", instructions="""
         This server provides weather info.
@@ -47,7 +48,7 @@ async def get_weather(city: str) -> str:
         "temperature": round(temperature, 2),
         "humidity": round(humidity, 2),
     }
-    return str(weather_info)
+    return encode_result(weather_info)
     
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Run the Weather MCP server.")
@@ -1,14 +1,25 @@
 import datetime
+import math
+import os
+import sys
 import time
+from pathlib import Path
 from urllib.parse import urlparse
+from jinja2.sandbox import ImmutableSandboxedEnvironment
 from openai.types.chat import ChatCompletionMessage
 from openai.types.chat.chat_completion import ChatCompletion, Choice
 
-from flask import (Flask, redirect, render_template, request, make_response,
+from flask import (Flask, g, redirect, render_template, request, make_response,
                    send_from_directory, url_for)
 from transformers import AutoTokenizer, AutoModelForCausalLM, AutoConfig
+from transformers.generation.streamers import BaseStreamer
 import torch
 
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+# phy-2 has no build of its own and shares phy-3's admission control
+sys.path.append(str(Path(__file__).resolve().parent.parent / "phy-3"))
+from admission import AdmissionController, Overloaded
+
 app = Flask(__name__)
 
 # Load the model and tokenizer from the Hugging Face model hub
@@ -18,6 +29,66 @@ tokenizer = AutoTokenizer.from_pretrained("microsoft/Phi-3-mini-4k-instruct", tr
 
 print("Pretained tokenizer and model loaded...")
 
+# The chat template is compiled once at startup instead of on every request
+CHAT_TEMPLATE = "{% for message in messages %}{{'<|' + message['role'] + '|>' + '\n' + message['content'] + '<|end|>\n' }}{% endfor %}"
+tokenizer.chat_template = CHAT_TEMPLATE
+compiled_template = ImmutableSandboxedEnvironment(trim_blocks=True, lstrip_blocks=True).from_string(CHAT_TEMPLATE)
+
+REQUESTS = Counter("backend_requests_total", "Completion requests served, by HTTP status.", ["status"])
+LATENCY = Histogram("backend_request_duration_seconds", "Completion request latency.")
+IN_FLIGHT = Gauge("backend_requests_in_flight", "Completion requests currently waiting or being served.")
+QUEUE_DEPTH = Gauge("backend_queue_depth", "Completion requests waiting for a generation slot.")
+REJECTED = Counter("backend_requests_rejected_total", "Completion requests rejected by admission control, by reason.", ["reason"])
+TOKENS_GENERATED = Counter("slm_tokens_generated_total", "Completion tokens generated by the model.")
+BATCH_SIZE = Histogram("slm_batch_size", "Sequences per model.generate() call.", buckets=(1, 2, 4, 8, 16, 32))
+STAGE_DURATION = Histogram("slm_stage_duration_seconds", "Time spent in each stage of the completion request path.", ["stage"])
+
+# Bounded queue in front of the model so overload surfaces as a 429 instead of a timeout
+admission = AdmissionController(
+    max_concurrency=int(os.getenv("SLM_MAX_CONCURRENCY", "1")),
+    max_queue=int(os.getenv("SLM_MAX_QUEUE", "8")),
+    max_queue_wait=int(os.getenv("SLM_MAX_QUEUE_WAIT_MS", "30000")) / 1000,
+    on_queue_change=QUEUE_DEPTH.inc,
+)
+
+
+class FirstTokenTimer(BaseStreamer):
+    """Streamer that records when generate() emits the first new token, splitting prefill from decode."""
+
+    def __init__(self):
+        self.puts = 0
+        self.first_token_at = None
+
+    def put(self, value):
+        # The first put() carries the prompt, the second one the first generated token
+        self.puts += 1
+        if self.puts == 2:
+            self.first_token_at = time.perf_counter()
+
+    def end(self):
+        pass
+
+
+@app.before_request
+def start_timer():
+    if request.endpoint == "completions":
+        g.started = time.perf_counter()
+        IN_FLIGHT.inc()
+
+
+@app.after_request
+def record_request(response):
+    if "started" in g:
+        REQUESTS.labels(status=response.status_code).inc()
+        LATENCY.observe(time.perf_counter() - g.started)
+    return response
+
+
+@app.teardown_request
+def stop_timer(exception):
+    if "started" in g:
+        IN_FLIGHT.dec()
+
 
 @app.route('/')
 def index():
@@ -33,7 +104,6 @@ def completions(deployment_name):
 
     try:
         messages = json_data.get("messages")
-        template = "{% for message in messages %}{{'<|' + message['role'] + '|>' + '\n' + message['content'] + '<|end|>\n' }}{% endfor %}"
         max_tokens = 200
         temperature = 0.6
 
@@ -42,10 +112,25 @@ def completions(deployment_name):
 
             print("[", datetime.datetime.now().time(),"] Received request from ",request.remote_addr," with the following messages: ",messages)
 
-            tokenizer.chat_template = template
-            tokenized_chat = tokenizer.apply_chat_template(messages, tokenize=True, add_generation_prompt=True, return_tensors="pt")
-            outputs = model.generate(tokenized_chat, max_new_tokens=max_tokens, eos_token_id=32007)  # 32007 corresponds to <|end|>
-            completion_text = tokenizer.batch_decode(outputs)[0]
+            with admission.admit():
+                started = time.perf_counter()
+                prompt = compiled_template.render(messages=messages, add_generation_prompt=True)
+                templated = time.perf_counter()
+                tokenized_chat = tokenizer(prompt, add_special_tokens=False, return_tensors="pt")
+                tokenized = time.perf_counter()
+                timer = FirstTokenTimer()
+                outputs = model.generate(**tokenized_chat, max_new_tokens=max_tokens, eos_token_id=32007, streamer=timer)  # 32007 corresponds to <|end|>
+                generated = time.perf_counter()
+                # Only decode the newly generated tokens, not the echoed prompt
+                prompt_length = tokenized_chat["input_ids"].shape[-1]
+                completion_text = tokenizer.decode(outputs[0][prompt_length:], skip_special_tokens=True)
+                first_token_at = timer.first_token_at or generated
+                STAGE_DURATION.labels(stage="template").observe(templated - started)
+                STAGE_DURATION.labels(stage="tokenize").observe(tokenized - templated)
+                STAGE_DURATION.labels(stage="prefill").observe(first_token_at - tokenized)
+                STAGE_DURATION.labels(stage="decode").observe(time.perf_counter() - first_token_at)
+                TOKENS_GENERATED.inc(outputs.shape[-1] - prompt_length)
+                BATCH_SIZE.observe(outputs.shape[0])
 
             completion = ChatCompletion(
                 id="foo",
@@ -67,6 +152,14 @@ def completions(deployment_name):
         else:
             response = make_response({'error': {'code': '500', 'message': 'The prompt was not provided.'}})
 
+    except Overloaded as e:
+        print("Rejected: ", e)
+        REJECTED.labels(reason=e.reason).inc()
+        retry_after_ms = math.ceil(e.retry_after * 1000)
+        response = make_response({'error': {'code': '429', 'message': f'The model is overloaded. Try again in {math.ceil(e.retry_after)} seconds.'}}, 429)
+        response.headers["retry-after-ms"] = str(retry_after_ms)
+        response.headers["Retry-After"] = str(math.ceil(e.retry_after))
+
     except Exception as e:
         print("Error: ", e)
         response = make_response({'error': {'code': '500', 'message': 'An error occurred.'}})
@@ -74,6 +167,12 @@ def completions(deployment_name):
     response.headers["x-ms-region"] = hostname
     return response
 
+@app.route("/metrics")
+def metrics_endpoint():
+    response = make_response(generate_latest())
+    response.headers["Content-Type"] = CONTENT_TYPE_LATEST
+    return response
+
 if __name__ == '__main__':
    app.run()
 
@@ -0,0 +1,84 @@
+"""Admission control for the SLM host.
+
+Generation is bounded by a fixed number of concurrent slots. Requests wait for
+a slot in a bounded queue for at most `max_queue_wait` seconds; when the queue
+is full, or the predicted wait already exceeds that bound, they are rejected
+immediately so APIM gets a 429 it can retry on another backend instead of a
+request that times out.
+"""
+import threading
+import time
+from contextlib import contextmanager
+
+
+class Overloaded(Exception):
+    """Raised when a request is not admitted. `retry_after` is in seconds."""
+
+    def __init__(self, reason, retry_after):
+        super().__init__(f"{reason}, retry after {retry_after:.3f}s")
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+
+    def __init__(self, max_concurrency, max_queue, max_queue_wait, on_queue_change=None):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.max_queue_wait = max_queue_wait
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._lock = threading.Lock()
+        self._waiting = 0
+        # Exponentially weighted average of the time a request holds a slot
+        self._service_time = None
+        self._on_queue_change = on_queue_change or (lambda delta: None)
+
+    @property
+    def waiting(self):
+        return self._waiting
+
+    def drain_rate(self):
+        """Requests per second the host currently completes, or None before the first one."""
+        if not self._service_time:
+            return None
+        return self.max_concurrency / self._service_time
+
+    def retry_after(self, ahead=None):
+        """Estimate how long until `ahead` queued requests (default: the whole queue) have drained."""
+        if ahead is None:
+            ahead = self._waiting
+        rate = self.drain_rate()
+        if rate is None:
+            return self.max_queue_wait
+        return (ahead + 1) / rate
+
+    @contextmanager
+    def admit(self):
+        with self._lock:
+            if self._waiting >= self.max_queue:
+                raise Overloaded("queue_full", self.retry_after())
+            # Reject up front when the requests already queued cannot drain within the wait bound
+            rate = self.drain_rate()
+            if rate and self._waiting / rate > self.max_queue_wait:
+                raise Overloaded("queue_wait", self.retry_after())
+            self._waiting += 1
+        self._on_queue_change(1)
+
+        acquired = self._slots.acquire(timeout=self.max_queue_wait)
+        with self._lock:
+            self._waiting -= 1
+        self._on_queue_change(-1)
+        if not acquired:
+            raise Overloaded("queue_timeout", self.retry_after())
+
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            elapsed = time.monotonic() - started
+            with self._lock:
+                if self._service_time is None:
+                    self._service_time = elapsed
+                else:
+                    self._service_time = 0.8 * self._service_time + 0.2 * elapsed
+            self._slots.release()
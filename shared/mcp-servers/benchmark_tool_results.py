@@ -0,0 +1,73 @@
+"""Compare the size of MCP tool results before and after compact JSON encoding.
+
+Prints bytes and tokens per response for the previous encodings (Python repr for the
+weather/on-call tools, indented JSON for show_user_profile) and for encode_result.
+Tokens are counted with tiktoken (o200k_base) when it is installed.
+
+    python benchmark_tool_results.py
+"""
+
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "weather", "http"))
+from result_encoder import encode_result  # noqa: E402
+
+try:
+    import tiktoken
+    _encoding = tiktoken.get_encoding("o200k_base")
+except ImportError:
+    _encoding = None
+
+# Representative results of each tool
+SAMPLES = {
+    "get_cities": (str, ["New York", "Los Angeles", "Chicago", "Houston", "Phoenix"]),
+    "get_weather": (str, {"city": "Lisbon", "condition": "Sunny", "temperature": 21.37, "humidity": 64.02}),
+    "get_oncall_list": (str, [
+        {"id": 1, "firstName": "Julia", "lastName": "Smith", "alias": "jsmith", "status": "on", "timezone": "PST"},
+        {"id": 2, "firstName": "Alex", "lastName": "Johnson", "alias": "ajohnson", "status": "on", "timezone": "EST"},
+        {"id": 3, "firstName": "Maria", "lastName": "Garcia", "alias": "mgarcia", "status": "off", "timezone": "CET"},
+        {"id": 4, "firstName": "David", "lastName": "Wilson", "alias": "dwilson", "status": "on", "timezone": "CET"},
+        {"id": 5, "firstName": "Sarah", "lastName": "Chen", "alias": "schen", "status": "on", "timezone": "CET"},
+        {"id": 6, "firstName": "Michael", "lastName": "Brown", "alias": "mbrown", "status": "off", "timezone": "PST"},
+        {"id": 7, "firstName": "Emma", "lastName": "Taylor", "alias": "etaylor", "status": "on", "timezone": "PST"},
+    ]),
+    "show_user_profile": (lambda value: json.dumps(value, indent=2), {
+        "displayName": "Julia Smith",
+        "email": "julia.smith@contoso.com",
+        "id": "6e7b768e-07e2-4810-8459-485f84f8f204",
+        "jobTitle": "Site Reliability Engineer",
+        "department": "Platform",
+        "officeLocation": "Lisbon",
+    }),
+}
+
+
+def count_tokens(text: str) -> int | None:
+    return len(_encoding.encode(text)) if _encoding else None
+
+
+def main():
+    print(f"{'tool':<20}{'bytes before':>14}{'bytes after':>13}{'tokens before':>15}{'tokens after':>14}{'saved':>8}")
+    for tool, (previous_encoder, value) in SAMPLES.items():
+        before = previous_encoder(value)
+        after = encode_result(value)
+        bytes_before, bytes_after = len(before.encode()), len(after.encode())
+        tokens_before, tokens_after = count_tokens(before), count_tokens(after)
+        if tokens_before:
+            saved = 1 - tokens_after / tokens_before
+        else:
+            saved = 1 - bytes_after / bytes_before
+        print(
+            f"{tool:<20}{bytes_before:>14}{bytes_after:>13}"
+            f"{tokens_before if tokens_before is not None else '-':>15}"
+            f"{tokens_after if tokens_after is not None else '-':>14}"
+            f"{saved:>8.0%}"
+        )
+    if _encoding is None:
+        print("\ntiktoken is not installed; 'saved' is based on bytes (pip install tiktoken for token counts)")
+
+
+if __name__ == "__main__":
+    main()
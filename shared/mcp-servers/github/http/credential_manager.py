@@ -1,11 +1,14 @@
+import asyncio
+import time
 import uuid
-from azure.identity import DefaultAzureCredential
-from azure.mgmt.apimanagement import ApiManagementClient
+from azure.identity.aio import DefaultAzureCredential
+from azure.mgmt.apimanagement.aio import ApiManagementClient
 from azure.mgmt.apimanagement.models import (
     AuthorizationContract,
     AuthorizationAccessPolicyContract,
     AuthorizationLoginRequestContract,
 )
+from session_store import InMemorySessionStore, SessionStore
 
 
 class CredentialManager:
@@ -22,6 +25,9 @@ class CredentialManager:
         authorization_provider_id: str,
         authorization_type: str = "OAuth2",
         oauth2_grant_type: str = "AuthorizationCode",
+        connected_ttl: float = 300.0,
+        not_connected_ttl: float = 5.0,
+        session_store: SessionStore | None = None,
     ):
         self.tenant_id = tenant_id
         self.subscription_id = subscription_id
@@ -32,16 +38,46 @@ class CredentialManager:
         self.authorization_provider_id = authorization_provider_id
         self.authorization_type = authorization_type
         self.oauth2_grant_type = oauth2_grant_type
+        self.connected_ttl = connected_ttl
+        self.not_connected_ttl = not_connected_ttl
+        self.session_store = session_store or InMemorySessionStore()
+        self._credential = DefaultAzureCredential()
         self._client = ApiManagementClient(
-            credential=DefaultAzureCredential(),
+            credential=self._credential,
             subscription_id=subscription_id,
         )
+        # session id -> (status, expires_at); a 'Connected' status is kept for connected_ttl,
+        # anything else only for not_connected_ttl so a completed login is picked up quickly
+        self._status_cache: dict[str, tuple[str | None, float]] = {}
+        self._status_locks: dict[str, asyncio.Lock] = {}
+        self._assign_lock = asyncio.Lock()
 
-    def _get_authorization_id(self, session_id: str) -> str:
-        """Build the authorization id from the provider and session."""
-        return f"{self.authorization_provider_id.lower()}-{session_id}"
+    async def close(self) -> None:
+        """Close the underlying ARM client and credential."""
+        await self._client.close()
+        await self._credential.close()
 
-    def is_authorized(self, session_id: str) -> bool:
+    def invalidate(self, session_id: str) -> None:
+        """Drop the cached authorization status for a session, e.g. after a 401 from the provider.
+
+        Args:
+            session_id: The MCP session identifier.
+        """
+        self._status_cache.pop(session_id, None)
+
+    async def _get_authorization_id(self, session_id: str) -> str:
+        """Look up the authorization id of the session, assigning a new one to unknown sessions."""
+        authorization_id = await self.session_store.get(session_id)
+        if authorization_id is None:
+            # Checked again under the lock so concurrent first calls agree on one id
+            async with self._assign_lock:
+                authorization_id = await self.session_store.get(session_id)
+                if authorization_id is None:
+                    authorization_id = f"{self.authorization_provider_id.lower()}-{uuid.uuid4().hex}"
+                    await self.session_store.set(session_id, authorization_id)
+        return authorization_id
+
+    async def is_authorized(self, session_id: str) -> bool:
         """Check if the session already has a connected authorization.
 
         Args:
@@ -50,10 +86,53 @@ class CredentialManager:
         Returns:
             True if the authorization status is 'Connected', False otherwise.
         """
-        return self._get_authorization_status(session_id) == "Connected"
+        return await self._get_cached_authorization_status(session_id) == "Connected"
+
+    async def _get_cached_authorization_status(self, session_id: str) -> str | None:
+        """Get the authorization status for a session, served from the cache while fresh.
+
+        Concurrent lookups for the same session share a single ARM call.
+
+        Args:
+            session_id: The MCP session identifier.
+
+        Returns:
+            The status string ('Connected', 'Error', etc.) or None if not found.
+        """
+        cached = self._status_cache.get(session_id)
+        if cached and cached[1] > time.monotonic():
+            return cached[0]
+
+        async with self._status_locks.setdefault(session_id, asyncio.Lock()):
+            status = await self._refresh_authorization_status(session_id)
+        self._prune()
+        return status
+
+    async def _refresh_authorization_status(self, session_id: str) -> str | None:
+        """Return the cached status if fresh, otherwise read it from ARM and cache it.
 
-    def _get_authorization_status(self, session_id: str) -> str | None:
-        """Get the current authorization status for a session.
+        The caller must hold the session's status lock.
+        """
+        cached = self._status_cache.get(session_id)
+        if cached and cached[1] > time.monotonic():
+            return cached[0]
+        status = await self._get_authorization_status(session_id)
+        ttl = self.connected_ttl if status == "Connected" else self.not_connected_ttl
+        self._status_cache[session_id] = (status, time.monotonic() + ttl)
+        return status
+
+    def _prune(self) -> None:
+        """Evict expired cache entries so sessions that went away do not accumulate."""
+        now = time.monotonic()
+        for session_id, (_, expires_at) in list(self._status_cache.items()):
+            if expires_at <= now:
+                del self._status_cache[session_id]
+        for session_id, lock in list(self._status_locks.items()):
+            if session_id not in self._status_cache and not lock.locked():
+                del self._status_locks[session_id]
+
+    async def _get_authorization_status(self, session_id: str) -> str | None:
+        """Get the current authorization status for a session from ARM.
 
         Args:
             session_id: The MCP session identifier.
@@ -61,9 +140,9 @@ class CredentialManager:
         Returns:
             The status string ('Connected', 'Error', etc.) or None if not found.
         """
-        authorization_id = self._get_authorization_id(session_id)
+        authorization_id = await self._get_authorization_id(session_id)
         try:
-            response = self._client.authorization.get(
+            response = await self._client.authorization.get(
                 resource_group_name=self.resource_group_name,
                 service_name=self.service_name,
                 authorization_provider_id=self.authorization_provider_id,
@@ -73,12 +152,14 @@ class CredentialManager:
         except Exception:
             return None
 
-    def get_login_url(self, session_id: str) -> str:
+    async def get_login_url(self, session_id: str) -> str:
         """Create an authorization and return the login URL for the user.
 
         If the session is already authorized, returns a message indicating so.
         If the authorization already exists (e.g. login pending), skips creation
         and returns the login link directly to avoid duplicate access policy errors.
+        The check and the creation run under the session's status lock, so
+        concurrent calls create the authorization only once.
 
         Args:
             session_id: The MCP session identifier.
@@ -86,42 +167,46 @@ class CredentialManager:
         Returns:
             The login URL string, or a message if already authorized.
         """
-        authorization_id = self._get_authorization_id(session_id)
-
-        status = self._get_authorization_status(session_id)
-
-        if status == "Connected":
-            return "Connection already authorized."
-
-        # Only create authorization and access policy if no authorization exists yet
-        if status is None:
-            # Create authorization
-            self._client.authorization.create_or_update(
-                resource_group_name=self.resource_group_name,
-                service_name=self.service_name,
-                authorization_provider_id=self.authorization_provider_id,
-                authorization_id=authorization_id,
-                parameters=AuthorizationContract(
-                    authorization_type=self.authorization_type,
-                    o_auth2_grant_type=self.oauth2_grant_type,
-                ),
-            )
-
-            # Create access policy for the APIM managed identity
-            self._client.authorization_access_policy.create_or_update(
-                resource_group_name=self.resource_group_name,
-                service_name=self.service_name,
-                authorization_provider_id=self.authorization_provider_id,
-                authorization_id=authorization_id,
-                authorization_access_policy_id=str(uuid.uuid4())[:33],
-                parameters=AuthorizationAccessPolicyContract(
-                    tenant_id=self.tenant_id,
-                    object_id=self.apim_identity_object_id,
-                ),
-            )
+        authorization_id = await self._get_authorization_id(session_id)
+
+        async with self._status_locks.setdefault(session_id, asyncio.Lock()):
+            status = await self._refresh_authorization_status(session_id)
+
+            if status == "Connected":
+                return "Connection already authorized."
+
+            # Only create authorization and access policy if no authorization exists yet
+            if status is None:
+                # Create authorization
+                await self._client.authorization.create_or_update(
+                    resource_group_name=self.resource_group_name,
+                    service_name=self.service_name,
+                    authorization_provider_id=self.authorization_provider_id,
+                    authorization_id=authorization_id,
+                    parameters=AuthorizationContract(
+                        authorization_type=self.authorization_type,
+                        o_auth2_grant_type=self.oauth2_grant_type,
+                    ),
+                )
+
+                # Create access policy for the APIM managed identity
+                await self._client.authorization_access_policy.create_or_update(
+                    resource_group_name=self.resource_group_name,
+                    service_name=self.service_name,
+                    authorization_provider_id=self.authorization_provider_id,
+                    authorization_id=authorization_id,
+                    authorization_access_policy_id=str(uuid.uuid4())[:33],
+                    parameters=AuthorizationAccessPolicyContract(
+                        tenant_id=self.tenant_id,
+                        object_id=self.apim_identity_object_id,
+                    ),
+                )
+
+                # The cached None is stale now; the next lookup reads the new authorization from ARM
+                self._status_cache.pop(session_id, None)
 
         # Get login link (works for both new and existing-but-pending authorizations)
-        response = self._client.authorization_login_links.post(
+        response = await self._client.authorization_login_links.post(
             resource_group_name=self.resource_group_name,
             service_name=self.service_name,
             authorization_provider_id=self.authorization_provider_id,
@@ -133,15 +218,17 @@ class CredentialManager:
 
         return response.login_link
 
-    def delete_authorization(self, session_id: str) -> None:
+    async def delete_authorization(self, session_id: str) -> None:
         """Delete the authorization for a session (cleanup).
 
         Args:
             session_id: The MCP session identifier.
         """
-        authorization_id = self._get_authorization_id(session_id)
+        authorization_id = await self._get_authorization_id(session_id)
+        self.invalidate(session_id)
+        self._status_locks.pop(session_id, None)
         try:
-            self._client.authorization.delete(
+            await self._client.authorization.delete(
                 resource_group_name=self.resource_group_name,
                 service_name=self.service_name,
                 authorization_provider_id=self.authorization_provider_id,
@@ -150,3 +237,4 @@ class CredentialManager:
             )
         except Exception:
             pass
+        await self.session_store.delete(session_id)
@@ -1,11 +1,39 @@
+import asyncio
 import httpx
+import json
 import os
+from collections import OrderedDict
+from contextlib import asynccontextmanager
 from fastmcp import FastMCP, Context
 from credential_manager import CredentialManager
+from session_store import create_session_store, session_key
 
 APIM_GATEWAY_URL = str(os.getenv("APIM_GATEWAY_URL"))
 
-mcp = FastMCP("GitHub")
+# GitHub's maximum page size for list endpoints
+ISSUES_PAGE_SIZE = 100
+MAX_ISSUES_LIMIT = 500
+# (authorization id, page url) -> (etag, projected issues) for conditional requests
+ETAG_CACHE_SIZE = 256
+_etag_cache: OrderedDict[tuple[str, str], tuple[str, list[dict]]] = OrderedDict()
+
+
+@asynccontextmanager
+async def lifespan(server: FastMCP):
+    """Share one pooled, keep-alive HTTP/2 client across all sessions and tool calls."""
+    async with httpx.AsyncClient(
+        base_url=APIM_GATEWAY_URL,
+        http2=True,
+        timeout=httpx.Timeout(30.0, connect=5.0),
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=30.0),
+    ) as http_client:
+        try:
+            yield {"http_client": http_client}
+        finally:
+            await credential_manager.close()
+
+
+mcp = FastMCP("GitHub", lifespan=lifespan)
 
 credential_manager = CredentialManager(
     tenant_id=str(os.getenv("AZURE_TENANT_ID")),
@@ -15,17 +43,23 @@ credential_manager = CredentialManager(
     apim_identity_object_id=str(os.getenv("APIM_IDENTITY_OBJECT_ID")),
     post_login_redirect_url=str(os.getenv("POST_LOGIN_REDIRECT_URL")),
     authorization_provider_id=str(os.getenv("AUTHORIZATION_PROVIDER_ID")),
+    session_store=create_session_store(),
 )
 
 
 def _get_session_id(ctx: Context) -> str:
-    """Extract the session id from the MCP context."""
-    return str(id(ctx.session))
+    """Key of the caller's authorization: their identity when configured, else the MCP session id."""
+    return session_key(ctx)
+
 
+def _get_http_client(ctx: Context) -> httpx.AsyncClient:
+    """Return the shared HTTP client created by the server lifespan."""
+    return ctx.lifespan_context["http_client"]
 
-def _get_github_headers(session_id: str) -> dict:
+
+async def _get_github_headers(session_id: str) -> dict:
     """Build headers for GitHub API calls via APIM."""
-    authorization_id = credential_manager._get_authorization_id(session_id)
+    authorization_id = await credential_manager._get_authorization_id(session_id)
     return {
         "Content-Type": "application/json",
         "authorizationId": authorization_id,
@@ -33,10 +67,56 @@ def _get_github_headers(session_id: str) -> dict:
     }
 
 
+def _project_issue(issue: dict) -> dict:
+    """Keep only the issue fields an agent needs."""
+    return {
+        "number": issue["number"],
+        "title": issue["title"],
+        "state": issue["state"],
+        "user": (issue.get("user") or {}).get("login"),
+        "labels": [label["name"] for label in issue.get("labels", [])],
+        "assignees": [assignee["login"] for assignee in issue.get("assignees", [])],
+        "comments": issue.get("comments", 0),
+        "is_pull_request": "pull_request" in issue,
+        "created_at": issue["created_at"],
+        "updated_at": issue["updated_at"],
+        "url": issue["html_url"],
+    }
+
+
+async def _get_issues_page(
+    ctx: Context, session_id: str, path: str, params: dict
+) -> tuple[httpx.Response, list[dict] | None]:
+    """Fetch one page of issues, revalidating a previously seen page with its ETag.
+
+    Returns the response and the projected issues, or None for the issues if the request failed.
+    """
+    headers = await _get_github_headers(session_id)
+    cache_key = (headers["authorizationId"], str(httpx.URL(path, params=params)))
+    cached = _etag_cache.get(cache_key)
+    if cached:
+        headers["If-None-Match"] = cached[0]
+
+    response = await _get_http_client(ctx).get(path, params=params, headers=headers)
+    if response.status_code == 304 and cached:
+        _etag_cache.move_to_end(cache_key)
+        return response, cached[1]
+    if response.status_code != 200:
+        return response, None
+
+    issues = [_project_issue(issue) for issue in response.json()]
+    if etag := response.headers.get("ETag"):
+        _etag_cache[cache_key] = (etag, issues)
+        _etag_cache.move_to_end(cache_key)
+        while len(_etag_cache) > ETAG_CACHE_SIZE:
+            _etag_cache.popitem(last=False)
+    return response, issues
+
+
 async def _ensure_authorized(session_id: str) -> str | None:
     """Check authorization and return login URL if not yet authorized."""
-    if not credential_manager.is_authorized(session_id):
-        login_url = credential_manager.get_login_url(session_id)
+    if not await credential_manager.is_authorized(session_id):
+        login_url = await credential_manager.get_login_url(session_id)
         return f"Please authorize by opening this link: {login_url}"
     return None
 
@@ -55,10 +135,13 @@ async def get_user(ctx: Context) -> str:
     if auth_message:
         return auth_message
 
-    response = httpx.get(
-        f"{APIM_GATEWAY_URL}/user",
-        headers=_get_github_headers(session_id),
+    response = await _get_http_client(ctx).get(
+        "/user",
+        headers=await _get_github_headers(session_id),
     )
+    if response.status_code == 401:
+        # The cached 'Connected' status is stale (e.g. token revoked), re-check ARM next time
+        credential_manager.invalidate(session_id)
     if response.status_code == 200:
         return f"User: {response.json()}"
     else:
@@ -66,15 +149,26 @@ async def get_user(ctx: Context) -> str:
 
 
 @mcp.tool()
-async def get_issues(ctx: Context, username: str, repo: str) -> str:
-    """Get all issues for the specified repository for the authenticated user.
+async def get_issues(
+    ctx: Context,
+    username: str,
+    repo: str,
+    state: str = "open",
+    limit: int = 30,
+    cursor: str | None = None,
+) -> str:
+    """Get issues for the specified repository for the authenticated user.
 
     Args:
         username: The GitHub username
         repo: The repository name
+        state: Issue state to list: 'open', 'closed' or 'all'
+        limit: Maximum number of issues to return (up to 500)
+        cursor: The next_cursor value from a previous call, to continue listing
 
     Returns:
-        A list of issues if the connection is authorized, otherwise a message with the login URL.
+        Compact JSON with the issues and a next_cursor (null on the last page) if the connection
+        is authorized, otherwise a message with the login URL.
     """
     session_id = _get_session_id(ctx)
     print(f"Getting the list of issues... SessionId: {session_id}")
@@ -83,14 +177,48 @@ async def get_issues(ctx: Context, username: str, repo: str) -> str:
     if auth_message:
         return auth_message
 
-    response = httpx.get(
-        f"{APIM_GATEWAY_URL}/repos/{username}/{repo}/issues",
-        headers=_get_github_headers(session_id),
-    )
-    if response.status_code == 200:
-        return f"Issues: {response.json()}"
-    else:
-        return f"Unable to get issues. Status code: {response.status_code}, Response: {response.text}"
+    if cursor and not (cursor.isascii() and cursor.isdigit()):
+        return f"Invalid cursor: {cursor!r}. Pass the next_cursor value from a previous call."
+    offset = int(cursor) if cursor else 0
+    limit = max(1, min(limit, MAX_ISSUES_LIMIT))
+    first_page = offset // ISSUES_PAGE_SIZE + 1
+    last_page = (offset + limit - 1) // ISSUES_PAGE_SIZE + 1
+    pages = range(first_page, last_page + 1)
+
+    path = f"/repos/{username}/{repo}/issues"
+    completed = 0
+
+    async def fetch(page: int) -> tuple[httpx.Response, list[dict] | None]:
+        nonlocal completed
+        result = await _get_issues_page(
+            ctx, session_id, path, {"state": state, "per_page": ISSUES_PAGE_SIZE, "page": page}
+        )
+        completed += 1
+        await ctx.report_progress(completed, len(pages))
+        return result
+
+    # All pages covering [offset, offset + limit) are known up front, so fetch them concurrently
+    results = await asyncio.gather(*(fetch(page) for page in pages))
+
+    issues = []
+    for response, page_issues in results:
+        if page_issues is None:
+            if response.status_code == 401:
+                # The cached 'Connected' status is stale (e.g. token revoked), re-check ARM next time
+                credential_manager.invalidate(session_id)
+            return f"Unable to get issues. Status code: {response.status_code}, Response: {response.text}"
+        issues.extend(page_issues)
+
+    start = offset - (first_page - 1) * ISSUES_PAGE_SIZE
+    selected = issues[start:start + limit]
+    last_response = results[-1][0]
+    has_more = len(issues) > start + limit or 'rel="next"' in last_response.headers.get("Link", "")
+    # A 304 carries no Link header, so fall back to whether the last page was full
+    if last_response.status_code == 304:
+        has_more = len(results[-1][1]) == ISSUES_PAGE_SIZE or len(issues) > start + limit
+    next_cursor = str(offset + len(selected)) if has_more and selected else None
+
+    return json.dumps({"issues": selected, "next_cursor": next_cursor}, separators=(",", ":"))
 
 
 if __name__ == "__main__":
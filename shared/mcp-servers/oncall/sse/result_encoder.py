@@ -0,0 +1,17 @@
+import json
+
+try:
+    import orjson
+except ImportError:  # orjson is optional, the stdlib encoder produces the same output
+    orjson = None
+
+
+def encode_result(value) -> str:
+    """Serialize a tool result as minified JSON.
+
+    Python reprs (str(list)/str(dict)) and indented JSON cost the model extra tokens for
+    quotes, whitespace and indentation without adding information. Uses orjson when installed.
+    """
+    if orjson is not None:
+        return orjson.dumps(value).decode()
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
@@ -24,6 +24,7 @@ from starlette.responses import JSONResponse
 
 from config.azure_ad_options import AzureAdOptions
 from tools.show_user_profile_tool import ShowUserProfileTool
+from tools.show_user_overview_tool import ShowUserOverviewTool
 from controllers.auth_controller import AuthController
 
 
@@ -44,12 +45,22 @@ except ValueError as e:
     raise
 
 
+@asynccontextmanager
+async def lifespan(server: FastMCP):
+    """Close the Graph batch HTTP client when the server stops."""
+    try:
+        yield {}
+    finally:
+        await user_overview_tool.aclose()
+
+
 # Initialize FastMCP server
-mcp = FastMCP("remote-mcp-msgraph")
+mcp = FastMCP("remote-mcp-msgraph", lifespan=lifespan)
 
 
 # Initialize the tool
 user_profile_tool = ShowUserProfileTool(azure_ad_options)
+user_overview_tool = ShowUserOverviewTool(azure_ad_options)
 
 
 @mcp.tool()
@@ -82,6 +93,34 @@ async def show_user_profile() -> str:
     return await user_profile_tool.show_user_profile(request)
 
 
+@mcp.tool()
+async def show_user_overview() -> str:
+    """Retrieves the current user's profile, manager, photo metadata and group memberships from Microsoft Graph API.
+    
+    Use this instead of chaining several tools when more than the basic profile is needed: all
+    lookups are sent in a single Microsoft Graph $batch request using the On-Behalf-Of (OBO) flow.
+    It requires a valid Bearer token in the Authorization header.
+    
+    Returns:
+        A compact JSON string containing the user's profile fields (as show_user_profile) plus:
+        - manager: The manager's displayName, email and jobTitle, or null
+        - photo: The profile photo width and height, or null if the user has no photo
+        - groups: Display names of the groups the user is a member of, or null
+        - errors: HTTP status per lookup that failed, only present if any did
+    
+    Raises:
+        Returns error JSON if authentication fails or user consent is required.
+    """
+    # Get request from FastMCP context
+    ctx = get_context()
+    
+    if not ctx or not hasattr(ctx, 'request_context'):
+        return '{"error": "Request context not available"}'
+    
+    request = ctx.request_context.request
+    return await user_overview_tool.show_user_overview(request)
+
+
 @mcp.custom_route("/auth/callback", methods=["GET"])
 async def auth_callback(request: StarletteRequest):
     """Handle OAuth callback from Azure AD."""
@@ -0,0 +1,141 @@
+"""MCP tool for retrieving the current user's profile, manager, photo and groups in one Microsoft Graph $batch request."""
+
+import asyncio
+import logging
+from typing import Optional
+
+import httpx
+from starlette.requests import Request
+from azure.core.exceptions import ClientAuthenticationError
+
+from config.azure_ad_options import AzureAdOptions
+from tools.show_user_profile_tool import ShowUserProfileTool
+from utilities.graph_client_helper import GraphClientHelper
+from utilities.result_encoder import encode_result
+
+
+logger = logging.getLogger(__name__)
+
+GRAPH_BATCH_URL = "https://graph.microsoft.com/v1.0/$batch"
+GRAPH_SCOPE = "https://graph.microsoft.com/.default"
+
+# Every lookup projects only the fields the tool returns
+BATCH_REQUESTS = [
+    {"id": "profile", "method": "GET", "url": "/me?$select=id,displayName,mail,userPrincipalName,jobTitle,department,officeLocation"},
+    {"id": "manager", "method": "GET", "url": "/me/manager?$select=id,displayName,mail,jobTitle"},
+    {"id": "photo", "method": "GET", "url": "/me/photo?$select=id,height,width"},
+    {"id": "groups", "method": "GET", "url": "/me/memberOf/microsoft.graph.group?$select=id,displayName&$top=100"},
+]
+
+
+class ShowUserOverviewTool(ShowUserProfileTool):
+    """MCP tool that fetches the user's profile, manager, photo metadata and group memberships in one round trip."""
+
+    def __init__(self, azure_ad_options: AzureAdOptions):
+        """Initialize the ShowUserOverviewTool.
+
+        Args:
+            azure_ad_options: Azure AD configuration options.
+        """
+        super().__init__(azure_ad_options)
+        self._http_client: Optional[httpx.AsyncClient] = None
+
+    def _get_http_client(self) -> httpx.AsyncClient:
+        """Return the shared keep-alive HTTP client used for Graph batch requests."""
+        if self._http_client is None:
+            self._http_client = httpx.AsyncClient(timeout=httpx.Timeout(30.0, connect=5.0))
+        return self._http_client
+
+    async def aclose(self) -> None:
+        """Close the HTTP client, if it was created."""
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
+
+    async def show_user_overview(self, request: Request) -> str:
+        """Retrieves the current user's profile, manager, photo metadata and groups from Microsoft Graph.
+
+        Args:
+            request: The Starlette request object containing authorization header.
+
+        Returns:
+            A compact JSON string with the user's overview or error.
+        """
+        access_token, error_response = self._extract_access_token(request)
+        if error_response:
+            return error_response
+
+        try:
+            credential = GraphClientHelper.get_graph_credential(access_token, self.azure_ad_options)
+            # Served from the token cache on repeated calls; only a cache miss performs the OBO exchange
+            graph_token = await asyncio.to_thread(credential.get_token, GRAPH_SCOPE)
+
+            response = await self._get_http_client().post(
+                GRAPH_BATCH_URL,
+                headers={"Authorization": f"Bearer {graph_token.token}"},
+                json={"requests": BATCH_REQUESTS},
+            )
+            response.raise_for_status()
+            return self._build_overview(response.json())
+
+        except ClientAuthenticationError as ex:
+            # Check if this is a consent-required error
+            if self._is_consent_required_error(ex):
+                consent_response = {
+                    "error": "User consent required",
+                    "message": "Please provide the following URL to user and ask them to login in order to call Microsoft Graph API",
+                    "loginUrl": self._generate_login_url(request)
+                }
+                return encode_result(consent_response)
+
+            logger.error(f"Authentication failed while retrieving user overview: {ex}")
+            return self._create_error_response(f"Authentication failed: {str(ex)}")
+
+        except Exception as ex:
+            logger.error(f"Unexpected error occurred while retrieving user overview: {ex}")
+            return self._create_error_response(f"An unexpected error occurred: {str(ex)}")
+
+    @staticmethod
+    def _build_overview(batch_response: dict) -> str:
+        """Combine the individual $batch responses into one compact JSON document.
+
+        Parts that failed (e.g. no manager, no photo, or missing consent for group memberships)
+        are returned as null, with their HTTP status listed under "errors".
+
+        Args:
+            batch_response: The parsed JSON body of the $batch response.
+
+        Returns:
+            A compact JSON string.
+        """
+        bodies = {}
+        errors = {}
+        for item in batch_response.get("responses", []):
+            if 200 <= item.get("status", 500) < 300:
+                bodies[item["id"]] = item.get("body") or {}
+            else:
+                errors[item["id"]] = item.get("status")
+
+        profile = bodies.get("profile", {})
+        manager = bodies.get("manager")
+        photo = bodies.get("photo")
+        groups = bodies.get("groups")
+
+        overview = {
+            "displayName": profile.get("displayName"),
+            "email": profile.get("mail") or profile.get("userPrincipalName"),
+            "id": profile.get("id"),
+            "jobTitle": profile.get("jobTitle"),
+            "department": profile.get("department"),
+            "officeLocation": profile.get("officeLocation"),
+            "manager": {
+                "displayName": manager.get("displayName"),
+                "email": manager.get("mail"),
+                "jobTitle": manager.get("jobTitle"),
+            } if manager else None,
+            "photo": {"width": photo.get("width"), "height": photo.get("height")} if photo else None,
+            "groups": [group.get("displayName") for group in groups.get("value", [])] if groups else None,
+        }
+        if errors:
+            overview["errors"] = errors
+        return encode_result(overview)
@@ -1,6 +1,5 @@
 """MCP tool for retrieving the current user's profile information from Microsoft Graph."""
 
-import json
 import logging
 import hashlib
 import base64
@@ -13,6 +12,7 @@ from azure.core.exceptions import ClientAuthenticationError
 
 from config.azure_ad_options import AzureAdOptions
 from utilities.graph_client_helper import GraphClientHelper
+from utilities.result_encoder import encode_result
 
 
 logger = logging.getLogger(__name__)
@@ -38,25 +38,9 @@ class ShowUserProfileTool:
         Returns:
             A JSON string representation of the user's profile information or error.
         """
-        # Extract authorization header
-        auth_header = request.headers.get("Authorization")
-        
-        if not auth_header:
-            logger.warning("Authorization header not found in request")
-            return self._create_error_response("Authorization header not found in request")
-        
-        # Extract Bearer token
-        if not auth_header.lower().startswith("bearer "):
-            logger.warning("Authorization header does not contain a Bearer token")
-            return self._create_error_response("Authorization header must contain a Bearer token")
-        
-        access_token = auth_header[7:].strip()  # Remove "Bearer " prefix
-        
-        if not access_token:
-            logger.warning("Bearer token is empty in Authorization header")
-            return self._create_error_response("Bearer token is empty in Authorization header")
-        
-        logger.debug("Access token found in Authorization header")
+        access_token, error_response = self._extract_access_token(request)
+        if error_response:
+            return error_response
         
         try:
             # Create Graph client and get user profile
@@ -81,7 +65,7 @@ class ShowUserProfileTool:
                 "officeLocation": user.office_location
             }
             
-            return json.dumps(user_profile, indent=2)
+            return encode_result(user_profile)
             
         except ClientAuthenticationError as ex:
             # Check if this is a consent-required error
@@ -92,7 +76,7 @@ class ShowUserProfileTool:
                     "message": "Please provide the following URL to user and ask them to login in order to call Microsoft Graph API",
                     "loginUrl": login_url
                 }
-                return json.dumps(consent_response, indent=2)
+                return encode_result(consent_response)
             
             logger.error(f"Authentication failed while retrieving user profile: {ex}")
             return self._create_error_response(f"Authentication failed: {str(ex)}")
@@ -101,6 +85,36 @@ class ShowUserProfileTool:
             logger.error(f"Unexpected error occurred while retrieving user profile: {ex}")
             return self._create_error_response(f"An unexpected error occurred: {str(ex)}")
     
+    def _extract_access_token(self, request: Request) -> tuple[Optional[str], Optional[str]]:
+        """Extract the Bearer token from the request's Authorization header.
+        
+        Args:
+            request: The Starlette request object containing authorization header.
+            
+        Returns:
+            A tuple of the access token and None, or None and a JSON error response.
+        """
+        # Extract authorization header
+        auth_header = request.headers.get("Authorization")
+        
+        if not auth_header:
+            logger.warning("Authorization header not found in request")
+            return None, self._create_error_response("Authorization header not found in request")
+        
+        # Extract Bearer token
+        if not auth_header.lower().startswith("bearer "):
+            logger.warning("Authorization header does not contain a Bearer token")
+            return None, self._create_error_response("Authorization header must contain a Bearer token")
+        
+        access_token = auth_header[7:].strip()  # Remove "Bearer " prefix
+        
+        if not access_token:
+            logger.warning("Bearer token is empty in Authorization header")
+            return None, self._create_error_response("Bearer token is empty in Authorization header")
+        
+        logger.debug("Access token found in Authorization header")
+        return access_token, None
+    
     def _is_consent_required_error(self, ex: Exception) -> bool:
         """Check if the exception indicates user consent is required.
         
@@ -189,4 +203,4 @@ class ShowUserProfileTool:
             A JSON string containing the error.
         """
         error_response = {"error": message}
-        return json.dumps(error_response, indent=2)
+        return encode_result(error_response)
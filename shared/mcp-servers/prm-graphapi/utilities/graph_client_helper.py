@@ -4,65 +4,201 @@ from azure.identity import OnBehalfOfCredential, ManagedIdentityCredential
 from azure.core.credentials import AccessToken
 from msgraph import GraphServiceClient
 from config.azure_ad_options import AzureAdOptions
+from collections import OrderedDict
 from typing import Callable
 import asyncio
+import base64
+import hashlib
+import json
+import threading
+import time
+
+
+class CachedTokenCredential:
+    """Token credential wrapper that serves tokens from memory until shortly before they expire."""
+
+    def __init__(self, credential, refresh_margin: int = 300):
+        """Initialize the CachedTokenCredential.
+
+        Args:
+            credential: The credential whose tokens are cached.
+            refresh_margin: Seconds before expiry at which a token is refreshed.
+        """
+        self._credential = credential
+        self._refresh_margin = refresh_margin
+        self._tokens: dict[tuple, AccessToken] = {}
+        self._lock = threading.Lock()
+
+    def get_token(self, *scopes: str, claims: str | None = None, **kwargs) -> AccessToken:
+        """Return a cached token for the scopes, requesting a new one when missing or expiring.
+
+        Claims challenges always bypass the cache, since they ask for a token the cached one does not satisfy.
+        """
+        if claims:
+            return self._credential.get_token(*scopes, claims=claims, **kwargs)
+
+        key = (scopes, kwargs.get("tenant_id"), kwargs.get("enable_cae", False))
+        token = self._tokens.get(key)
+        if token and token.expires_on - self._refresh_margin > time.time():
+            return token
+
+        with self._lock:
+            token = self._tokens.get(key)
+            if token and token.expires_on - self._refresh_margin > time.time():
+                return token
+            token = self._credential.get_token(*scopes, **kwargs)
+            self._tokens[key] = token
+            return token
 
 
 class GraphClientHelper:
-    """Utility class for creating Microsoft Graph clients using On-Behalf-Of (OBO) flow."""
-    
+    """Utility class for creating Microsoft Graph clients using On-Behalf-Of (OBO) flow.
+
+    Graph clients are cached per user assertion (keyed by its SHA-256 hash) until the assertion
+    expires, and their OBO tokens are cached until shortly before they expire, so repeated tool
+    calls by the same user do not go back to Entra ID. The managed identity client assertion is
+    shared by all users.
+    """
+
+    MAX_CACHED_CLIENTS = 1000
+    DEFAULT_CLIENT_TTL = 300
+
+    _graph_clients: "OrderedDict[str, tuple[GraphServiceClient, CachedTokenCredential, float]]" = OrderedDict()
+    _managed_identities: dict[str, CachedTokenCredential] = {}
+    _lock = threading.Lock()
+
     @staticmethod
     def create_graph_client(access_token: str, azure_ad_options: AzureAdOptions) -> GraphServiceClient:
-        """Creates a GraphServiceClient using On-Behalf-Of authentication flow.
-        
+        """Returns a GraphServiceClient using On-Behalf-Of authentication flow, reusing a cached one when possible.
+
         Args:
             access_token: The access token to use for OBO flow.
             azure_ad_options: Azure AD configuration options.
-            
+
         Returns:
             A configured GraphServiceClient instance.
-            
+
+        Raises:
+            ValueError: If access token is None or empty.
+        """
+        return GraphClientHelper._get_cached_entry(access_token, azure_ad_options)[0]
+
+    @staticmethod
+    def get_graph_credential(access_token: str, azure_ad_options: AzureAdOptions) -> CachedTokenCredential:
+        """Returns the token-caching OBO credential for raw Microsoft Graph requests (e.g. $batch).
+
+        Args:
+            access_token: The access token to use for OBO flow.
+            azure_ad_options: Azure AD configuration options.
+
+        Returns:
+            The credential shared with the cached GraphServiceClient of the same user assertion.
+
         Raises:
             ValueError: If access token is None or empty.
         """
+        return GraphClientHelper._get_cached_entry(access_token, azure_ad_options)[1]
+
+    @staticmethod
+    def _get_cached_entry(
+        access_token: str,
+        azure_ad_options: AzureAdOptions
+    ) -> tuple[GraphServiceClient, CachedTokenCredential, float]:
+        """Returns the cached Graph client and credential for a user assertion, creating them if needed."""
         if not access_token or not access_token.strip():
             raise ValueError("Access token cannot be null or empty.")
-        
-        credential = GraphClientHelper._create_on_behalf_of_credential(
-            access_token, 
+
+        # Never keep the raw user token as a key
+        cache_key = hashlib.sha256(access_token.encode("utf-8")).hexdigest()
+        now = time.time()
+        with GraphClientHelper._lock:
+            cached = GraphClientHelper._graph_clients.get(cache_key)
+            if cached and cached[2] > now:
+                GraphClientHelper._graph_clients.move_to_end(cache_key)
+                return cached
+
+        credential = CachedTokenCredential(GraphClientHelper._create_on_behalf_of_credential(
+            access_token,
             azure_ad_options
-        )
-        return GraphServiceClient(credentials=credential)
-    
+        ))
+        graph_client = GraphServiceClient(credentials=credential)
+        expires_at = GraphClientHelper._get_token_expiry(access_token) or now + GraphClientHelper.DEFAULT_CLIENT_TTL
+        entry = (graph_client, credential, expires_at)
+
+        with GraphClientHelper._lock:
+            GraphClientHelper._graph_clients[cache_key] = entry
+            GraphClientHelper._graph_clients.move_to_end(cache_key)
+            for key, cached in list(GraphClientHelper._graph_clients.items()):
+                if cached[2] <= now:
+                    del GraphClientHelper._graph_clients[key]
+            while len(GraphClientHelper._graph_clients) > GraphClientHelper.MAX_CACHED_CLIENTS:
+                GraphClientHelper._graph_clients.popitem(last=False)
+        return entry
+
+    @staticmethod
+    def _get_token_expiry(access_token: str) -> float | None:
+        """Read the expiry ('exp' claim) of a JWT without validating it.
+
+        The token was already validated upstream; the expiry only bounds how long the client is cached.
+
+        Args:
+            access_token: The JWT access token.
+
+        Returns:
+            The expiry as a Unix timestamp, or None if it cannot be read.
+        """
+        try:
+            payload = access_token.split(".")[1]
+            payload += "=" * (-len(payload) % 4)
+            return float(json.loads(base64.urlsafe_b64decode(payload))["exp"])
+        except (IndexError, KeyError, TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def _get_managed_identity(azure_ad_options: AzureAdOptions) -> CachedTokenCredential:
+        """Returns the shared, token-caching managed identity credential used for client assertions.
+
+        Args:
+            azure_ad_options: Azure AD configuration options.
+
+        Returns:
+            The cached managed identity credential.
+        """
+        client_id = azure_ad_options.managed_identity_client_id
+        with GraphClientHelper._lock:
+            managed_identity = GraphClientHelper._managed_identities.get(client_id)
+            if managed_identity is None:
+                managed_identity = CachedTokenCredential(ManagedIdentityCredential(client_id=client_id))
+                GraphClientHelper._managed_identities[client_id] = managed_identity
+            return managed_identity
+
     @staticmethod
     def _create_on_behalf_of_credential(
-        access_token: str, 
+        access_token: str,
         azure_ad_options: AzureAdOptions
     ) -> OnBehalfOfCredential:
         """Creates an OnBehalfOfCredential for Microsoft Graph authentication.
-        
+
         Args:
             access_token: The access token to use for OBO flow.
             azure_ad_options: Azure AD configuration options.
-            
+
         Returns:
             Configured OnBehalfOfCredential instance.
         """
 
-        managed_identity = ManagedIdentityCredential(
-            client_id=azure_ad_options.managed_identity_client_id
-        )
-        
+        managed_identity = GraphClientHelper._get_managed_identity(azure_ad_options)
+
         def client_assertion_callback() -> str:
             """Callback to get client assertion token from managed identity.
-            
+
             Returns:
                 The access token string.
             """
             # Get token for federated credential exchange
             token_result = managed_identity.get_token("api://AzureADTokenExchange")
             return token_result.token
-        
+
         return OnBehalfOfCredential(
             tenant_id=azure_ad_options.tenant_id,
             client_id=azure_ad_options.client_id,
@@ -10,8 +10,10 @@ except ModuleNotFoundError:  # fall back to the layout you used originally
 from starlette.applications import Starlette
 from starlette.routing import Mount
 import os, httpx, uuid, asyncio
-from azure.identity import DefaultAzureCredential
-from azure.mgmt.apimanagement import ApiManagementClient
+from contextlib import asynccontextmanager
+from session_store import create_session_store, session_key
+from azure.identity.aio import DefaultAzureCredential
+from azure.mgmt.apimanagement.aio import ApiManagementClient
 from azure.mgmt.apimanagement.models import AuthorizationContract, AuthorizationAccessPolicyContract, AuthorizationLoginRequestContract
 
 mcp = FastMCP("Spotify")
@@ -25,12 +27,53 @@ AZURE_TENANT_ID = str(os.getenv("AZURE_TENANT_ID"))
 AZURE_CLIENT_ID = str(os.getenv("AZURE_CLIENT_ID"))
 POST_LOGIN_REDIRECT_URL = str(os.getenv("POST_LOGIN_REDIRECT_URL"))
 APIM_IDENTITY_OBJECT_ID = str(os.getenv("APIM_IDENTITY_OBJECT_ID"))
+
+# One process-wide ARM client, created on first use; its credential caches the ARM token between tool calls
+apim_credential: DefaultAzureCredential | None = None
+apim_client: ApiManagementClient | None = None
+
+def get_apim_client() -> ApiManagementClient:
+    global apim_client, apim_credential
+    if apim_client is None:
+        print("Creating API Management client...")
+        apim_credential = DefaultAzureCredential()
+        apim_client = ApiManagementClient(
+            credential=apim_credential,
+            subscription_id=SUBSCRIPTION_ID,
+        )
+    return apim_client
+
+async def close_apim_client() -> None:
+    """Close the ARM client and its credential on shutdown, if they were created."""
+    global apim_client, apim_credential
+    if apim_client is not None:
+        await apim_client.close()
+        await apim_credential.close()
+        apim_client = apim_credential = None
+
 idp = "spotify"
 
-def get_headers(ctx: Context):
+session_store = create_session_store()
+assign_lock = asyncio.Lock()
+
+async def get_authorization_id(ctx: Context) -> str:
+    """Look up the authorization id of the caller, assigning a new one to unknown callers."""
+    key = session_key(ctx)
+    authorization_id = await session_store.get(key)
+    if authorization_id is None:
+        # Checked again under the lock so concurrent first calls agree on one id
+        async with assign_lock:
+            authorization_id = await session_store.get(key)
+            if authorization_id is None:
+                authorization_id = f"{idp.lower()}-{uuid.uuid4().hex}"
+                await session_store.set(key, authorization_id)
+    return authorization_id
+
+
+async def get_headers(ctx: Context):
     headers = {
         "Content-Type": "application/json",
-        "authorizationId": f"{idp.lower()}-{str(id(ctx.session))}",
+        "authorizationId": await get_authorization_id(ctx),
         "providerId": idp.lower() 
     }
     return headers
@@ -50,20 +93,16 @@ async def authorize_spotify(ctx: Context) -> str:
     print(f"AZURE_TENANT_ID: {AZURE_TENANT_ID}")
     print(f"APIM Gateway URL: {APIM_GATEWAY_URL}")
 
-    session_id = str(id(ctx.session))
+    session_id = ctx.session_id
     provider_id = idp.lower()
-    authorization_id = f"{provider_id}-{session_id}"
+    authorization_id = await get_authorization_id(ctx)
     
     print(f"SessionId: {session_id}")
 
-    print("Creating API Management client...")
-    client = ApiManagementClient(
-        credential=DefaultAzureCredential(),
-        subscription_id=SUBSCRIPTION_ID,
-    )
+    client = get_apim_client()
 
     try:
-        response = client.authorization.get(
+        response = await client.authorization.get(
             resource_group_name=RESOURCE_GROUP_NAME,
             service_name=APIM_SERVICE_NAME,
             authorization_provider_id=idp,
@@ -76,7 +115,7 @@ async def authorize_spotify(ctx: Context) -> str:
         print(f"Failed to get authorization")
 
     print("Getting authorization provider...")
-    response = client.authorization_provider.get(
+    response = await client.authorization_provider.get(
         resource_group_name=RESOURCE_GROUP_NAME,
         service_name=APIM_SERVICE_NAME,
         authorization_provider_id=idp,
@@ -88,7 +127,7 @@ async def authorize_spotify(ctx: Context) -> str:
     )
 
     print("Creating or updating authorization...")
-    response = client.authorization.create_or_update(
+    response = await client.authorization.create_or_update(
         resource_group_name=RESOURCE_GROUP_NAME,
         service_name=APIM_SERVICE_NAME,
         authorization_provider_id=idp,
@@ -96,42 +135,29 @@ async def authorize_spotify(ctx: Context) -> str:
         parameters=authContract
     )
 
-    authPolicyContract: AuthorizationAccessPolicyContract = AuthorizationAccessPolicyContract(
-        tenant_id=AZURE_TENANT_ID,
-        object_id=APIM_IDENTITY_OBJECT_ID
-    )
-
-    print("Creating or updating authorization access policy...")
-    response = client.authorization_access_policy.create_or_update(
-        resource_group_name=RESOURCE_GROUP_NAME,
-        service_name=APIM_SERVICE_NAME,
-        authorization_provider_id=idp,
-        authorization_id=authorization_id,
-        authorization_access_policy_id=str(uuid.uuid4())[:33],
-        parameters=authPolicyContract
-    )
-
-    authPolicyContract: AuthorizationAccessPolicyContract = AuthorizationAccessPolicyContract(
-        tenant_id=AZURE_TENANT_ID,
-        object_id=AZURE_CLIENT_ID
-    )
-
-    print("Creating or updating authorization access policy...")
-    response = client.authorization_access_policy.create_or_update(
-        resource_group_name=RESOURCE_GROUP_NAME,
-        service_name=APIM_SERVICE_NAME,
-        authorization_provider_id=idp,
-        authorization_id=authorization_id,
-        authorization_access_policy_id=str(uuid.uuid4())[:33],
-        parameters=authPolicyContract
-    )
+    print("Creating or updating authorization access policies...")
+    # The access policies for the APIM identity and for this app's identity are independent
+    await asyncio.gather(*(
+        client.authorization_access_policy.create_or_update(
+            resource_group_name=RESOURCE_GROUP_NAME,
+            service_name=APIM_SERVICE_NAME,
+            authorization_provider_id=idp,
+            authorization_id=authorization_id,
+            authorization_access_policy_id=str(uuid.uuid4())[:33],
+            parameters=AuthorizationAccessPolicyContract(
+                tenant_id=AZURE_TENANT_ID,
+                object_id=object_id
+            )
+        )
+        for object_id in (APIM_IDENTITY_OBJECT_ID, AZURE_CLIENT_ID)
+    ))
 
     authLoginRequestContract: AuthorizationLoginRequestContract = AuthorizationLoginRequestContract(
         post_login_redirect_url=POST_LOGIN_REDIRECT_URL
     )
 
     print("Getting authorization link...")
-    response = client.authorization_login_links.post(
+    response = await client.authorization_login_links.post(
         resource_group_name=RESOURCE_GROUP_NAME,
         service_name=APIM_SERVICE_NAME,
         authorization_provider_id=idp,
@@ -150,7 +176,7 @@ async def get_user_playlists(ctx: Context) -> str:
     Returns:
         Playlists for the user
     """
-    response = httpx.get(f"{APIM_GATEWAY_URL}/me/playlists?limit=5", headers=get_headers(ctx))
+    response = httpx.get(f"{APIM_GATEWAY_URL}/me/playlists?limit=5", headers=await get_headers(ctx))
     if (response.status_code == 200):
         return f"Playlists: {response.json()}"
     else:
@@ -163,7 +189,7 @@ async def get_player_queue(ctx: Context) -> str:
     Returns:
         Playback queue
     """
-    response = httpx.get(f"{APIM_GATEWAY_URL}/me/player/queue", headers=get_headers(ctx))
+    response = httpx.get(f"{APIM_GATEWAY_URL}/me/player/queue", headers=await get_headers(ctx))
     if (response.status_code == 200):
         return f"Playback queue: {response.json()}"
     else:
@@ -176,7 +202,7 @@ async def get_playback_status(ctx: Context) -> str:
     Returns:
         Playback status
     """
-    response = httpx.get(f"{APIM_GATEWAY_URL}/me/player", headers=get_headers(ctx))
+    response = httpx.get(f"{APIM_GATEWAY_URL}/me/player", headers=await get_headers(ctx))
     if (response.status_code == 200):
         return f"Playback status: {response.json()}"
     else:
@@ -189,7 +215,7 @@ async def start_playback(ctx: Context) -> str:
     Returns:
         Confirmation that the playback was started
     """
-    response = httpx.put(f"{APIM_GATEWAY_URL}/me/player/play", headers=get_headers(ctx))
+    response = httpx.put(f"{APIM_GATEWAY_URL}/me/player/play", headers=await get_headers(ctx))
     if (response.status_code == 200):
         return f"Playback was started!"
     else:
@@ -202,7 +228,7 @@ async def pause_playback(ctx: Context) -> str:
     Returns:
         Confirmation of pause
     """
-    response = httpx.put(f"{APIM_GATEWAY_URL}/me/player/pause", headers=get_headers(ctx))
+    response = httpx.put(f"{APIM_GATEWAY_URL}/me/player/pause", headers=await get_headers(ctx))
     if (response.status_code == 200):
         return f"Playback was paused!"
     else:
@@ -215,7 +241,7 @@ async def get_my_queue(ctx: Context) -> str:
     Returns:
         The playing queue
     """
-    response = httpx.get(f"{APIM_GATEWAY_URL}/me/player/queue", headers=get_headers(ctx))
+    response = httpx.get(f"{APIM_GATEWAY_URL}/me/player/queue", headers=await get_headers(ctx))
     if (response.status_code == 200):
         return f"Playing queue: {response.json()}"
     else:
@@ -228,7 +254,7 @@ async def browse_new_releases(ctx: Context) -> str:
     Returns:
         A list of releases
     """
-    response = httpx.get(f"{APIM_GATEWAY_URL}/browse/new-releases?limit=5", headers=get_headers(ctx))
+    response = httpx.get(f"{APIM_GATEWAY_URL}/browse/new-releases?limit=5", headers=await get_headers(ctx))
     if (response.status_code == 200):
         return f"New Releases: {response.json()}"
     else:
@@ -243,7 +269,7 @@ async def search(ctx: Context, query: str) -> str:
     Returns:
         Seach results
     """
-    response = httpx.get(f"{APIM_GATEWAY_URL}/search?q={query}&type=artist%2Calbum%2Ctrack&limit=5&market=US", headers=get_headers(ctx))
+    response = httpx.get(f"{APIM_GATEWAY_URL}/search?q={query}&type=artist%2Calbum%2Ctrack&limit=5&market=US", headers=await get_headers(ctx))
     print("SEARCH RESULT:", response)
     if (response.status_code == 200):
         return f"Search results: {response.json()}"
@@ -252,9 +278,18 @@ async def search(ctx: Context, query: str) -> str:
 
 # Expose an ASGI app that speaks Streamable HTTP at /mcp/
 mcp_asgi = mcp.http_app()
+
+@asynccontextmanager
+async def lifespan(app: Starlette):
+    async with mcp_asgi.lifespan(app):
+        try:
+            yield
+        finally:
+            await close_apim_client()
+
 app = Starlette(
     routes=[Mount("/spotify_mcp", app=mcp_asgi)],  # MCP will be at /spotify-mcp
-    lifespan=mcp_asgi.lifespan, 
+    lifespan=lifespan,
 )
 
 if __name__ == "__main__":
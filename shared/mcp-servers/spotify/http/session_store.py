@@ -0,0 +1,168 @@
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Protocol
+
+# Request header with a stable identity of the caller, set by a trusted proxy such as APIM
+SESSION_IDENTITY_HEADER = os.getenv("SESSION_IDENTITY_HEADER", "")
+
+
+class SessionStore(Protocol):
+    """Maps session keys (see session_key) to the APIM authorization id created for them."""
+
+    async def get(self, session_key: str) -> str | None: ...
+
+    async def set(self, session_key: str, authorization_id: str) -> None: ...
+
+    async def delete(self, session_key: str) -> None: ...
+
+
+def session_key(ctx: Any) -> str:
+    """Key of the caller of a tool in the session store.
+
+    The MCP session id is new whenever the client reconnects, which includes every restart of
+    the server, so an authorization keyed on it is not found again afterwards. When
+    SESSION_IDENTITY_HEADER names a request header carrying the caller's identity, that identity
+    is the key instead and the authorization follows the caller across sessions and restarts.
+    The header must be set by a proxy that overwrites any value sent by the client, e.g. an APIM
+    policy copying the oid claim of the validated token; without it the session id is used.
+    """
+    if SESSION_IDENTITY_HEADER:
+        request = getattr(ctx.request_context, "request", None)
+        identity = request.headers.get(SESSION_IDENTITY_HEADER) if request is not None else None
+        if identity:
+            return f"identity:{identity}"
+    return ctx.session_id
+
+
+class InMemorySessionStore:
+    """Process-local LRU store, bounded to `max_entries` sessions."""
+
+    def __init__(self, max_entries: int = 10_000):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, str] = OrderedDict()
+
+    async def get(self, session_key: str) -> str | None:
+        authorization_id = self._entries.get(session_key)
+        if authorization_id is not None:
+            self._entries.move_to_end(session_key)
+        return authorization_id
+
+    async def set(self, session_key: str, authorization_id: str) -> None:
+        self._entries[session_key] = authorization_id
+        self._entries.move_to_end(session_key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def delete(self, session_key: str) -> None:
+        self._entries.pop(session_key, None)
+
+
+class SqliteSessionStore:
+    """SQLite-backed store with an in-memory LRU in front of it.
+
+    Authorizations survive restarts of a single server instance. The database uses WAL mode,
+    which needs shared memory, so `path` must be on local disk: network filesystems such as
+    Azure Files are not supported and replicas cannot share the file. Queries run in worker
+    threads so they do not block the event loop. Entries not used for `max_age` seconds are
+    removed; reads refresh an entry at most once per `touch_interval` seconds.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_age: float = 7 * 24 * 3600,
+        cache_size: int = 10_000,
+        touch_interval: float = 3600.0,
+    ):
+        self.path = path
+        self.max_age = max_age
+        self.touch_interval = touch_interval
+        self._cache = InMemorySessionStore(cache_size)
+        # session key -> time its updated_at was last written, bounded like the cache
+        self._touched: OrderedDict[str, float] = OrderedDict()
+        self._touched_size = cache_size
+        self._local = threading.local()
+        with self._connect() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS sessions ("
+                "session_id TEXT PRIMARY KEY, authorization_id TEXT NOT NULL, updated_at REAL NOT NULL)"
+            )
+            connection.execute("DELETE FROM sessions WHERE updated_at < ?", (time.time() - self.max_age,))
+
+    def _connect(self) -> sqlite3.Connection:
+        # One connection per worker thread; sqlite3 connections are not shared between threads
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5.0)
+            connection.execute("PRAGMA journal_mode=WAL")
+            self._local.connection = connection
+        return connection
+
+    def _select(self, session_key: str) -> str | None:
+        row = self._connect().execute(
+            "SELECT authorization_id FROM sessions WHERE session_id = ? AND updated_at >= ?",
+            (session_key, time.time() - self.max_age),
+        ).fetchone()
+        return row[0] if row else None
+
+    def _execute(self, sql: str, parameters: tuple) -> None:
+        with self._connect() as connection:
+            connection.execute(sql, parameters)
+
+    async def get(self, session_key: str) -> str | None:
+        authorization_id = await self._cache.get(session_key)
+        if authorization_id is None:
+            authorization_id = await asyncio.to_thread(self._select, session_key)
+            if authorization_id is None:
+                return None
+            await self._cache.set(session_key, authorization_id)
+        await self._touch(session_key)
+        return authorization_id
+
+    async def set(self, session_key: str, authorization_id: str) -> None:
+        now = time.time()
+        await asyncio.to_thread(
+            self._execute,
+            "INSERT OR REPLACE INTO sessions (session_id, authorization_id, updated_at) VALUES (?, ?, ?)",
+            (session_key, authorization_id, now),
+        )
+        await self._cache.set(session_key, authorization_id)
+        self._mark_touched(session_key, now)
+
+    async def delete(self, session_key: str) -> None:
+        await asyncio.to_thread(self._execute, "DELETE FROM sessions WHERE session_id = ?", (session_key,))
+        await self._cache.delete(session_key)
+        self._touched.pop(session_key, None)
+
+    async def _touch(self, session_key: str) -> None:
+        """Refresh updated_at of an entry in use, so it expires `max_age` after its last use."""
+        now = time.time()
+        touched_at = self._touched.get(session_key)
+        if touched_at is not None and now - touched_at < self.touch_interval:
+            return
+        # Marked first so concurrent reads of the same entry do not all write
+        self._mark_touched(session_key, now)
+        await asyncio.to_thread(
+            self._execute, "UPDATE sessions SET updated_at = ? WHERE session_id = ?", (now, session_key)
+        )
+
+    def _mark_touched(self, session_key: str, now: float) -> None:
+        self._touched[session_key] = now
+        self._touched.move_to_end(session_key)
+        while len(self._touched) > self._touched_size:
+            self._touched.popitem(last=False)
+
+
+def create_session_store() -> SessionStore:
+    """Create the store configured by SESSION_STORE_PATH: SQLite when set, in-memory otherwise.
+
+    Neither store is shared between replicas; running several replicas needs session affinity.
+    """
+    path = os.getenv("SESSION_STORE_PATH")
+    if path:
+        return SqliteSessionStore(path)
+    return InMemorySessionStore()
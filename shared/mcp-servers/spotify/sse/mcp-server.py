@@ -1,5 +1,6 @@
 from typing import Any
-import httpx, os, uuid
+import asyncio, httpx, os, uuid, weakref
+from contextlib import asynccontextmanager
 from mcp.server.fastmcp import FastMCP, Context
 from starlette.applications import Starlette
 from mcp.server.sse import SseServerTransport
@@ -7,8 +8,8 @@ from starlette.requests import Request
 from starlette.routing import Mount, Route
 from mcp.server import Server
 import uvicorn
-from azure.identity import DefaultAzureCredential
-from azure.mgmt.apimanagement import ApiManagementClient
+from azure.identity.aio import DefaultAzureCredential
+from azure.mgmt.apimanagement.aio import ApiManagementClient
 from azure.mgmt.apimanagement.models import AuthorizationContract, AuthorizationAccessPolicyContract, AuthorizationLoginRequestContract
 
 
@@ -24,12 +25,50 @@ AZURE_TENANT_ID = str(os.getenv("AZURE_TENANT_ID"))
 AZURE_CLIENT_ID = str(os.getenv("AZURE_CLIENT_ID"))
 POST_LOGIN_REDIRECT_URL = str(os.getenv("POST_LOGIN_REDIRECT_URL"))
 APIM_IDENTITY_OBJECT_ID = str(os.getenv("APIM_IDENTITY_OBJECT_ID"))
+
+# One process-wide ARM client, created on first use; its credential caches the ARM token between tool calls
+apim_credential: DefaultAzureCredential | None = None
+apim_client: ApiManagementClient | None = None
+
+def get_apim_client() -> ApiManagementClient:
+    global apim_client, apim_credential
+    if apim_client is None:
+        print("Creating API Management client...")
+        apim_credential = DefaultAzureCredential()
+        apim_client = ApiManagementClient(
+            credential=apim_credential,
+            subscription_id=SUBSCRIPTION_ID,
+        )
+    return apim_client
+
+async def close_apim_client() -> None:
+    """Close the ARM client and its credential on shutdown, if they were created."""
+    global apim_client, apim_credential
+    if apim_client is not None:
+        await apim_client.close()
+        await apim_credential.close()
+        apim_client = apim_credential = None
+
 idp = "spotify"
 
+# Authorization id per live SSE session. Unlike id(ctx.session), which is reused once a session is
+# garbage collected, a new session always gets a new id. SSE sessions are bound to one connection
+# and replica, so there is nothing to persist across restarts.
+session_authorizations: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+def get_authorization_id(ctx: Context) -> str:
+    """Look up the authorization id of the MCP session, assigning a new one to unknown sessions."""
+    authorization_id = session_authorizations.get(ctx.session)
+    if authorization_id is None:
+        authorization_id = f"{idp.lower()}-{uuid.uuid4().hex}"
+        session_authorizations[ctx.session] = authorization_id
+    return authorization_id
+
+
 def get_headers(ctx: Context):
     headers = {
         "Content-Type": "application/json",
-        "authorizationId": f"{idp.lower()}-{str(id(ctx.session))}",
+        "authorizationId": get_authorization_id(ctx),
         "providerId": idp.lower() 
     }
     return headers
@@ -49,20 +88,15 @@ async def authorize_spotify(ctx: Context) -> str:
     print(f"AZURE_TENANT_ID: {AZURE_TENANT_ID}")
     print(f"APIM Gateway URL: {APIM_GATEWAY_URL}")
 
-    session_id = str(id(ctx.session))
     provider_id = idp.lower()
-    authorization_id = f"{provider_id}-{session_id}"
+    authorization_id = get_authorization_id(ctx)
     
-    print(f"SessionId: {session_id}")
+    print(f"AuthorizationId: {authorization_id}")
 
-    print("Creating API Management client...")
-    client = ApiManagementClient(
-        credential=DefaultAzureCredential(),
-        subscription_id=SUBSCRIPTION_ID,
-    )
+    client = get_apim_client()
 
     try:
-        response = client.authorization.get(
+        response = await client.authorization.get(
             resource_group_name=RESOURCE_GROUP_NAME,
             service_name=APIM_SERVICE_NAME,
             authorization_provider_id=idp,
@@ -75,7 +109,7 @@ async def authorize_spotify(ctx: Context) -> str:
         print(f"Failed to get authorization")
 
     print("Getting authorization provider...")
-    response = client.authorization_provider.get(
+    response = await client.authorization_provider.get(
         resource_group_name=RESOURCE_GROUP_NAME,
         service_name=APIM_SERVICE_NAME,
         authorization_provider_id=idp,
@@ -87,7 +121,7 @@ async def authorize_spotify(ctx: Context) -> str:
     )
 
     print("Creating or updating authorization...")
-    response = client.authorization.create_or_update(
+    response = await client.authorization.create_or_update(
         resource_group_name=RESOURCE_GROUP_NAME,
         service_name=APIM_SERVICE_NAME,
         authorization_provider_id=idp,
@@ -95,42 +129,29 @@ async def authorize_spotify(ctx: Context) -> str:
         parameters=authContract
     )
 
-    authPolicyContract: AuthorizationAccessPolicyContract = AuthorizationAccessPolicyContract(
-        tenant_id=AZURE_TENANT_ID,
-        object_id=APIM_IDENTITY_OBJECT_ID
-    )
-
-    print("Creating or updating authorization access policy...")
-    response = client.authorization_access_policy.create_or_update(
-        resource_group_name=RESOURCE_GROUP_NAME,
-        service_name=APIM_SERVICE_NAME,
-        authorization_provider_id=idp,
-        authorization_id=authorization_id,
-        authorization_access_policy_id=str(uuid.uuid4())[:33],
-        parameters=authPolicyContract
-    )
-
-    authPolicyContract: AuthorizationAccessPolicyContract = AuthorizationAccessPolicyContract(
-        tenant_id=AZURE_TENANT_ID,
-        object_id=AZURE_CLIENT_ID
-    )
-
-    print("Creating or updating authorization access policy...")
-    response = client.authorization_access_policy.create_or_update(
-        resource_group_name=RESOURCE_GROUP_NAME,
-        service_name=APIM_SERVICE_NAME,
-        authorization_provider_id=idp,
-        authorization_id=authorization_id,
-        authorization_access_policy_id=str(uuid.uuid4())[:33],
-        parameters=authPolicyContract
-    )
+    print("Creating or updating authorization access policies...")
+    # The access policies for the APIM identity and for this app's identity are independent
+    await asyncio.gather(*(
+        client.authorization_access_policy.create_or_update(
+            resource_group_name=RESOURCE_GROUP_NAME,
+            service_name=APIM_SERVICE_NAME,
+            authorization_provider_id=idp,
+            authorization_id=authorization_id,
+            authorization_access_policy_id=str(uuid.uuid4())[:33],
+            parameters=AuthorizationAccessPolicyContract(
+                tenant_id=AZURE_TENANT_ID,
+                object_id=object_id
+            )
+        )
+        for object_id in (APIM_IDENTITY_OBJECT_ID, AZURE_CLIENT_ID)
+    ))
 
     authLoginRequestContract: AuthorizationLoginRequestContract = AuthorizationLoginRequestContract(
         post_login_redirect_url=POST_LOGIN_REDIRECT_URL
     )
 
     print("Getting authorization link...")
-    response = client.authorization_login_links.post(
+    response = await client.authorization_login_links.post(
         resource_group_name=RESOURCE_GROUP_NAME,
         service_name=APIM_SERVICE_NAME,
         authorization_provider_id=idp,
@@ -268,8 +289,16 @@ def create_starlette_app(mcp_server: Server, *, debug: bool = False) -> Starlett
                 mcp_server.create_initialization_options(),
             )
 
+    @asynccontextmanager
+    async def lifespan(app: Starlette):
+        try:
+            yield
+        finally:
+            await close_apim_client()
+
     return Starlette(
         debug=debug,
+        lifespan=lifespan,
         routes=[
             Route("/spotify/mcp/sse", endpoint=handle_sse),
             Mount("/spotify/mcp/messages/", app=sse.handle_post_message),
@@ -2,35 +2,47 @@ import random
 import httpx
 import os
 from fastmcp import FastMCP, Context
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from result_encoder import encode_result
+from tool_cache import cached_tool, cache_stats
 
 mcp = FastMCP("Weather")
 
+CITIES_BY_COUNTRY = {
+    "usa": ["New York", "Los Angeles", "Chicago", "Houston", "Phoenix"],
+    "canada": ["Toronto", "Vancouver", "Montreal", "Calgary", "Ottawa"],
+    "uk": ["London", "Manchester", "Birmingham", "Leeds", "Glasgow"],
+    "australia": ["Sydney", "Melbourne", "Brisbane", "Perth", "Adelaide"],
+    "india": ["Mumbai", "Delhi", "Bangalore", "Hyderabad", "Chennai"],
+    "portugal": ["Lisbon", "Porto", "Braga", "Faro", "Coimbra"],
+}
+WEATHER_CONDITIONS = ["Sunny", "Cloudy", "Rainy", "Snowy", "Windy"]
+
 @mcp.tool()
+@cached_tool(ttl=3600)
 async def get_cities(ctx: Context, country: str) -> str:
     """Get list of cities for a given country."""
-    cities_by_country = {
-        "usa": ["New York", "Los Angeles", "Chicago", "Houston", "Phoenix"],
-        "canada": ["Toronto", "Vancouver", "Montreal", "Calgary", "Ottawa"],
-        "uk": ["London", "Manchester", "Birmingham", "Leeds", "Glasgow"],
-        "australia": ["Sydney", "Melbourne", "Brisbane", "Perth", "Adelaide"],
-        "india": ["Mumbai", "Delhi", "Bangalore", "Hyderabad", "Chennai"],
-        "portugal": ["Lisbon", "Porto", "Braga", "Faro", "Coimbra"],
-    }
-    return str(cities_by_country.get(country.lower(), []))
+    return encode_result(CITIES_BY_COUNTRY.get(country.lower(), []))
 
 @mcp.tool()
+@cached_tool(ttl=60)
 async def get_weather(ctx: Context, city: str) -> str:
     """Get weather information for a given city."""
-    weather_conditions = ["Sunny", "Cloudy", "Rainy", "Snowy", "Windy"]
     temperature = random.uniform(-10, 35)
     humidity = random.uniform(20, 100)
     weather_info = {
         "city": city,
-        "condition": random.choice(weather_conditions),
+        "condition": random.choice(WEATHER_CONDITIONS),
         "temperature": round(temperature, 2),
         "humidity": round(humidity, 2),
     }
-    return str(weather_info)
+    return encode_result(weather_info)
+
+@mcp.custom_route("/cache-stats", methods=["GET"])
+async def get_cache_stats(request: Request) -> JSONResponse:
+    """Hit/miss counters of the tool result cache."""
+    return JSONResponse(cache_stats())
 
 if __name__ == "__main__":
     import argparse
@@ -0,0 +1,67 @@
+import functools
+import inspect
+import time
+from collections import OrderedDict
+
+# tool name -> statistics of every cached tool in this process
+_stats: dict[str, dict] = {}
+
+
+def cached_tool(ttl: float, maxsize: int = 1024):
+    """Cache the results of an async MCP tool, keyed on the tool name and its arguments.
+
+    Apply it below the @mcp.tool() decorator. The MCP Context argument is not part of the key.
+    Results expire after `ttl` seconds and at most `maxsize` entries are kept, least recently
+    used first out.
+    """
+
+    def decorator(func):
+        signature = inspect.signature(func)
+        entries: OrderedDict[tuple, tuple[float, object]] = OrderedDict()
+        stats = _stats[func.__name__] = {"hits": 0, "misses": 0, "size": 0, "ttl": ttl, "maxsize": maxsize}
+
+        def make_key(args, kwargs) -> tuple:
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            arguments = tuple(
+                (name, value) for name, value in bound.arguments.items()
+                if type(value).__name__ != "Context"
+            )
+            return (func.__name__, arguments)
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            key = make_key(args, kwargs)
+            try:
+                entry = entries.get(key)
+            except TypeError:
+                # Unhashable arguments are never cached
+                return await func(*args, **kwargs)
+            now = time.monotonic()
+            if entry is not None and entry[0] > now:
+                entries.move_to_end(key)
+                stats["hits"] += 1
+                return entry[1]
+
+            stats["misses"] += 1
+            result = await func(*args, **kwargs)
+            entries[key] = (now + ttl, result)
+            entries.move_to_end(key)
+            while len(entries) > maxsize:
+                entries.popitem(last=False)
+            stats["size"] = len(entries)
+            return result
+
+        def cache_clear():
+            entries.clear()
+            stats["size"] = 0
+
+        wrapper.cache_clear = cache_clear
+        return wrapper
+
+    return decorator
+
+
+def cache_stats() -> dict[str, dict]:
+    """Hit/miss counters and size of every cached tool."""
+    return {name: dict(stats) for name, stats in _stats.items()}
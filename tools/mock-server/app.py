@@ -4,11 +4,38 @@ from urllib.parse import urlparse
 from openai.types.chat import ChatCompletionMessage
 from openai.types.chat.chat_completion import ChatCompletion, Choice
 
-from flask import (Flask, redirect, render_template, request, make_response,
+from flask import (Flask, g, redirect, render_template, request, make_response,
                    send_from_directory, url_for)
 
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+
 app = Flask(__name__)
 
+REQUESTS = Counter("backend_requests_total", "Completion requests served, by HTTP status.", ["status"])
+LATENCY = Histogram("backend_request_duration_seconds", "Completion request latency, including the simulated wait time.")
+QUEUE_DEPTH = Gauge("backend_queue_depth", "Completion requests currently waiting or being served.")
+
+
+@app.before_request
+def start_timer():
+    if request.endpoint == "completions":
+        g.started = time.perf_counter()
+        QUEUE_DEPTH.inc()
+
+
+@app.after_request
+def record_request(response):
+    if "started" in g:
+        REQUESTS.labels(status=response.status_code).inc()
+        LATENCY.observe(time.perf_counter() - g.started)
+    return response
+
+
+@app.teardown_request
+def stop_timer(exception):
+    if "started" in g:
+        QUEUE_DEPTH.dec()
+
 
 @app.route('/')
 def index():
@@ -65,6 +92,12 @@ def completions(deployment_name):
     response.headers["x-ms-region"] = hostname
     return response
 
+@app.route("/metrics")
+def metrics_endpoint():
+    response = make_response(generate_latest())
+    response.headers["Content-Type"] = CONTENT_TYPE_LATEST
+    return response
+
 if __name__ == '__main__':
    app.run()
 